@@ -0,0 +1,77 @@
+from operator import itemgetter
+
+
+# Bases are a mask of occupied bases: bit 0 first, bit 1 second, bit 2
+# third.
+NUM_BASE_STATES = 8
+
+NUM_HIT_TYPES = 4
+
+# Indexes into the (first, second, third, batter, empty) tuple that
+# transitions pick the new runners from.
+BATTER = 3
+EMPTY = 4
+
+
+class Transition(object):
+    # Where every runner ends up after one outcome from one base state:
+    # next_bases is the new mask, runners picks the new (first, second,
+    # third) occupants and scorers lists who crossed the plate, in order.
+
+    __slots__ = ('next_bases', 'runs', 'sources', 'scorers', 'runners', )
+
+    def __init__(self, next_bases, sources, scorers):
+        self.next_bases = next_bases
+        self.runs = len(scorers)
+        self.sources = sources
+        self.scorers = scorers
+        self.runners = itemgetter(*sources)
+
+
+def _get_occupied(bases):
+    return [base for base in range(3) if bases & (1 << base)]
+
+
+def _build_walk_transition(bases):
+    # Only runners forced by the batter move, one base each.
+    sources = [EMPTY, EMPTY, EMPTY]
+    scorers = []
+    forced = 0
+    while forced < 3 and bases & (1 << forced):
+        forced += 1
+    for base in reversed(_get_occupied(bases)):
+        if base >= forced:
+            sources[base] = base
+        elif base == 2:
+            scorers.append(base)
+        else:
+            sources[base + 1] = base
+    sources[0] = BATTER
+    next_bases = sum(1 << base for base in range(3) if sources[base] != EMPTY)
+    return Transition(next_bases, tuple(sources), tuple(scorers))
+
+
+def _build_hit_transition(hit_type, bases):
+    # Every runner advances one base per base the batter takes.
+    amount = hit_type + 1
+    sources = [EMPTY, EMPTY, EMPTY]
+    scorers = []
+    for base in reversed(_get_occupied(bases)):
+        if base + amount > 2:
+            scorers.append(base)
+        else:
+            sources[base + amount] = base
+    if hit_type < 3:
+        sources[hit_type] = BATTER
+    else:
+        scorers.append(BATTER)
+    next_bases = sum(1 << base for base in range(3) if sources[base] != EMPTY)
+    return Transition(next_bases, tuple(sources), tuple(scorers))
+
+
+WALK_TRANSITIONS = tuple(_build_walk_transition(bases) for bases in range(NUM_BASE_STATES))
+
+HIT_TRANSITIONS = tuple(
+    tuple(_build_hit_transition(hit_type, bases) for bases in range(NUM_BASE_STATES))
+    for hit_type in range(NUM_HIT_TYPES)
+)
@@ -0,0 +1,178 @@
+import random
+import time
+from collections import Counter
+
+import profiles
+import sim
+import statlines
+
+
+TEAM_TYPES = ['away', 'home', ]
+
+
+class BatchResult(object):
+
+    def __init__(self, home_team, away_team):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.games = 0
+        self.home_wins = 0
+        self.extra_innings = 0
+        self.elapsed = 0.0
+        self.seed = None
+        self.runs = {team_type: Counter() for team_type in TEAM_TYPES}
+        # Team hits and walks from summaries; games added one at a time are
+        # counted in the per-player lines instead.
+        self.hits = {team_type: 0 for team_type in TEAM_TYPES}
+        self.walks = {team_type: 0 for team_type in TEAM_TYPES}
+        self.lines = None
+
+    def add_game(self, game):
+        self.games += 1
+        if game.stats['home']['runs'] > game.stats['away']['runs']:
+            self.home_wins += 1
+        if game.inning > 9:
+            self.extra_innings += 1
+        if self.lines is None:
+            self.lines = statlines.new_totals()
+        game.lines.add_to(self.lines)
+        for team_type in TEAM_TYPES:
+            self.runs[team_type][game.stats[team_type]['runs']] += 1
+
+    def add_summary(self, games, home_wins, extra_innings, runs, hits, walks):
+        self.games += games
+        self.home_wins += home_wins
+        self.extra_innings += extra_innings
+        for team_type in TEAM_TYPES:
+            self.runs[team_type].update(runs[team_type])
+            self.hits[team_type] += hits[team_type]
+            self.walks[team_type] += walks[team_type]
+
+    def merge(self, other):
+        self.games += other.games
+        self.home_wins += other.home_wins
+        self.extra_innings += other.extra_innings
+        self.elapsed += other.elapsed
+        for team_type in TEAM_TYPES:
+            self.runs[team_type].update(other.runs[team_type])
+            self.hits[team_type] += other.hits[team_type]
+            self.walks[team_type] += other.walks[team_type]
+        if other.lines is not None:
+            if self.lines is None:
+                self.lines = statlines.new_totals()
+            self.lines += other.lines
+        return self
+
+    def _get_line_total(self, team_type, stat):
+        if self.lines is None:
+            return 0
+        team = statlines.TEAM_INDEXES[team_type]
+        return int(self.lines[team, :statlines.NUM_BATTERS, stat].sum())
+
+    def get_batting_line(self, team_type, slot):
+        return statlines.get_batting_line(self.lines, statlines.TEAM_INDEXES[team_type], slot)
+
+    def get_pitching_line(self, team_type):
+        return statlines.get_pitching_line(self.lines, statlines.TEAM_INDEXES[team_type])
+
+    def _per_game(self, total):
+        if not self.games:
+            return 0.0
+        return float(total) / self.games
+
+    @property
+    def home_win_pct(self):
+        return self._per_game(self.home_wins)
+
+    @property
+    def away_win_pct(self):
+        return 1.0 - self.home_win_pct if self.games else 0.0
+
+    @property
+    def extra_inning_pct(self):
+        return self._per_game(self.extra_innings)
+
+    @property
+    def games_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.games / self.elapsed
+
+    def get_mean_runs(self, team_type):
+        total = sum(runs * count for runs, count in self.runs[team_type].items())
+        return self._per_game(total)
+
+    def get_mean_hits(self, team_type):
+        return self._per_game(self.hits[team_type] + self._get_line_total(team_type, statlines.HITS))
+
+    def get_mean_walks(self, team_type):
+        return self._per_game(
+            self.walks[team_type] + self._get_line_total(team_type, statlines.WALKS)
+        )
+
+    def get_run_distribution(self, team_type):
+        return {
+            runs: self._per_game(count)
+            for runs, count in sorted(self.runs[team_type].items())
+        }
+
+    def __str__(self):
+        lines = [
+            '{} games: {} at {}'.format(self.games, self.away_team.name, self.home_team.name),
+            '{:<6}{:>8}{:>8}{:>8}{:>8}'.format('Team', 'Win%', 'R/G', 'H/G', 'BB/G'),
+        ]
+        win_pcts = {'away': self.away_win_pct, 'home': self.home_win_pct}
+        teams = {'away': self.away_team, 'home': self.home_team}
+        for team_type in TEAM_TYPES:
+            lines.append('{:<6}{:>8.3f}{:>8.2f}{:>8.2f}{:>8.2f}'.format(
+                teams[team_type].teamID,
+                win_pcts[team_type],
+                self.get_mean_runs(team_type),
+                self.get_mean_hits(team_type),
+                self.get_mean_walks(team_type),
+            ))
+        lines.append('Extra innings: {:.3f}'.format(self.extra_inning_pct))
+        lines.append('Games/sec: {:.1f}'.format(self.games_per_second))
+        return '\n'.join(lines)
+
+
+def _compile_profiles(home_team, away_team):
+    return profiles.get_team_profile(home_team), profiles.get_team_profile(away_team)
+
+
+def simulate_games(home_team, away_team, num_games, rng=None, listener=None, seed=None,
+                   first_game=0, key=(), profiler=None):
+    # Unless a shared rng is passed, game N draws from the stream for
+    # (seed, key + (N, )), so any split of the games into chunks reproduces
+    # the same results.
+    if profiler is not None:
+        # Games are handed compiled profiles, so this is where the lineups
+        # are really built.
+        with profiler.activate(), profiler.timed('lineup.build'):
+            home_profile, away_profile = _compile_profiles(home_team, away_team)
+    else:
+        home_profile, away_profile = _compile_profiles(home_team, away_team)
+    if listener is None:
+        listener = sim.NullListener()
+    if rng is None and seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    result = BatchResult(home_profile, away_profile)
+    result.seed = seed
+    start = time.perf_counter()
+    for game_idx in range(first_game, first_game + num_games):
+        game = sim.Game(
+            home_profile,
+            away_profile,
+            0,
+            listener=listener,
+            rng=rng,
+            seed=seed,
+            profiler=profiler,
+            key=key,
+            game_idx=game_idx,
+        )
+        game.simulate()
+        result.add_game(game)
+    result.elapsed = time.perf_counter() - start
+    return result
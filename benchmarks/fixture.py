@@ -0,0 +1,174 @@
+import argparse
+import os
+import random
+import sqlite3
+
+import tables
+
+
+TEAMS = [
+    ('NYA', 'New York Yankees', 'AL'),
+    ('BOS', 'Boston Red Sox', 'AL'),
+    ('TBA', 'Tampa Bay Rays', 'AL'),
+    ('HOU', 'Houston Astros', 'AL'),
+]
+
+YEARS = [2018, 2019]
+
+# Unrelated batting rows, so lookups run against a table of realistic size.
+FILLER_ROWS = 20000
+
+FIELD_POSITIONS = ['C', '1B', '2B', '3B', 'SS', 'OF', 'OF', 'OF', 'OF', '1B', 'OF', 'C']
+
+SCHEMA = [
+    """CREATE TABLE people (
+        playerID TEXT, birthYear INTEGER, birthMonth INTEGER, birthDay INTEGER,
+        birthCountry TEXT, nameFirst TEXT, nameLast TEXT, nameGiven TEXT,
+        weight INTEGER, height INTEGER, bats TEXT, throws TEXT, debut TEXT,
+        finalGame TEXT, retroID TEXT, bbrefID TEXT
+    )""",
+    """CREATE TABLE teams (
+        ID INTEGER, yearID INTEGER, lgID TEXT, teamID TEXT, franchID TEXT,
+        divID TEXT, teamRank INTEGER, G INTEGER, Ghome INTEGER, W INTEGER,
+        L INTEGER, R INTEGER, AB INTEGER, H INTEGER, "2B" INTEGER,
+        "3B" INTEGER, HR INTEGER, BB INTEGER, SO INTEGER, ERA REAL,
+        E INTEGER, name TEXT, park TEXT
+    )""",
+    """CREATE TABLE batting (
+        ID INTEGER, playerID TEXT, yearID INTEGER, stint INTEGER,
+        teamID TEXT, team_ID INTEGER, lgID TEXT, G INTEGER, AB INTEGER,
+        R INTEGER, H INTEGER, "2B" INTEGER, "3B" INTEGER, HR INTEGER,
+        RBI INTEGER, SB INTEGER, CS INTEGER, BB INTEGER, SO INTEGER,
+        IBB INTEGER, HBP INTEGER, SH INTEGER, SF INTEGER, GIDP INTEGER
+    )""",
+    """CREATE TABLE pitching (
+        ID INTEGER, playerID TEXT, yearID INTEGER, stint INTEGER,
+        teamID TEXT, team_ID INTEGER, lgID TEXT, W INTEGER, L INTEGER,
+        G INTEGER, GS INTEGER, CG INTEGER, SHO INTEGER, SV INTEGER,
+        IPouts INTEGER, H INTEGER, ER INTEGER, HR INTEGER, BB INTEGER,
+        SO INTEGER, BAOpp REAL, ERA REAL, IBB INTEGER, WP INTEGER,
+        HBP INTEGER, BK INTEGER, BFP INTEGER, GF INTEGER, R INTEGER,
+        SH INTEGER, SF INTEGER, GIDP INTEGER
+    )""",
+    """CREATE TABLE fielding (
+        ID INTEGER, playerID TEXT, yearID INTEGER, stint INTEGER,
+        teamID TEXT, team_ID INTEGER, lgID TEXT, POS TEXT, G INTEGER,
+        GS INTEGER, InnOuts INTEGER, PO INTEGER, A INTEGER, E INTEGER,
+        DP INTEGER
+    )""",
+    """CREATE TABLE appearances (
+        ID INTEGER, yearID INTEGER, teamID TEXT, team_ID INTEGER,
+        lgID TEXT, playerID TEXT, G_all INTEGER, GS INTEGER,
+        G_batting INTEGER, G_defense INTEGER, G_p INTEGER, G_c INTEGER,
+        G_1b INTEGER, G_2b INTEGER, G_3b INTEGER, G_ss INTEGER,
+        G_lf INTEGER, G_cf INTEGER, G_rf INTEGER, G_of INTEGER,
+        G_dh INTEGER, G_ph INTEGER, G_pr INTEGER
+    )""",
+]
+
+
+def build_fixture(path, seed=2019, filler_rows=FILLER_ROWS):
+    # A small Lahman-shaped database: a few teams over two seasons with
+    # deterministic, plausible stat lines.
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed)
+    connection = sqlite3.connect(path)
+    for statement in SCHEMA:
+        connection.execute(statement)
+
+    ids = {'batting': 0, 'pitching': 0, 'fielding': 0, 'appearances': 0}
+
+    def next_id(table):
+        ids[table] += 1
+        return ids[table]
+
+    team_id = 0
+    player_num = 0
+    for year in YEARS:
+        for team_code, team_name, league in TEAMS:
+            team_id += 1
+            connection.execute(
+                'INSERT INTO teams (ID, yearID, lgID, teamID, franchID, G, W, L, name) '
+                'VALUES (?, ?, ?, ?, ?, 162, ?, ?, ?)',
+                (team_id, year, league, team_code, team_code, 81, 81, team_name),
+            )
+            roster = [('P', True)] * 5 + [(pos, False) for pos in FIELD_POSITIONS]
+            for idx, (position, is_pitcher) in enumerate(roster):
+                player_num += 1
+                player_id = 'plyr{:04d}'.format(player_num)
+                connection.execute(
+                    'INSERT INTO people (playerID, nameFirst, nameLast, bats, throws) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (player_id, 'First{}'.format(player_num), 'Last{}'.format(player_num),
+                     rng.choice('LRB'), rng.choice('LR')),
+                )
+                at_bats = rng.randint(5, 40) if is_pitcher else rng.randint(250, 650)
+                hits = max(1, int(at_bats * rng.uniform(0.18, 0.33)))
+                doubles = int(hits * rng.uniform(0.1, 0.25))
+                triples = int(hits * rng.uniform(0.0, 0.03))
+                home_runs = int(hits * rng.uniform(0.0, 0.2))
+                connection.execute(
+                    'INSERT INTO batting VALUES '
+                    '(?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (next_id('batting'), player_id, year, team_code, team_id, league,
+                     rng.randint(20, 160), at_bats, rng.randint(0, 100), hits, doubles,
+                     triples, home_runs, rng.randint(0, 100), rng.randint(0, 30),
+                     rng.randint(0, 10), int(at_bats * rng.uniform(0.05, 0.14)),
+                     int(at_bats * rng.uniform(0.12, 0.3)), 0, rng.randint(0, 8), 0,
+                     rng.randint(0, 8), rng.randint(0, 15)),
+                )
+                games_started = rng.randint(1, 150)
+                if is_pitcher:
+                    games_started = 30 - idx
+                    batters_faced = rng.randint(500, 900)
+                    connection.execute(
+                        'INSERT INTO pitching (ID, playerID, yearID, stint, teamID, team_ID, '
+                        'lgID, W, L, G, GS, H, BB, SO, ERA, BFP) '
+                        'VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (next_id('pitching'), player_id, year, team_code, team_id, league,
+                         rng.randint(5, 18), rng.randint(5, 15), 32, games_started,
+                         int(batters_faced * rng.uniform(0.18, 0.26)),
+                         int(batters_faced * rng.uniform(0.05, 0.1)),
+                         int(batters_faced * rng.uniform(0.15, 0.3)),
+                         rng.uniform(2.5, 5.5), batters_faced),
+                    )
+                connection.execute(
+                    'INSERT INTO fielding (ID, playerID, yearID, stint, teamID, team_ID, '
+                    'lgID, POS, G, GS, E) VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?)',
+                    (next_id('fielding'), player_id, year, team_code, team_id, league,
+                     position, games_started + 5, games_started, rng.randint(0, 15)),
+                )
+                connection.execute(
+                    'INSERT INTO appearances (ID, yearID, teamID, team_ID, lgID, playerID, '
+                    'G_all, GS, G_dh) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (next_id('appearances'), year, team_code, team_id, league, player_id,
+                     games_started + 5, games_started,
+                     0 if is_pitcher else rng.randint(0, 30)),
+                )
+
+    for _ in range(filler_rows):
+        connection.execute(
+            'INSERT INTO batting (ID, playerID, yearID, teamID, team_ID, AB, H) '
+            'VALUES (?, ?, 1900, ?, ?, 0, 0)',
+            (next_id('batting'), 'filler{:06d}'.format(ids['batting']), 'XXX', 0),
+        )
+    tables.create_indexes(connection)
+    connection.execute('ANALYZE;')
+    connection.commit()
+    connection.close()
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', action='store')
+    parser.add_argument(
+        '--filler_rows',
+        action='store',
+        type=int,
+        default=FILLER_ROWS,
+    )
+    args = parser.parse_args()
+
+    build_fixture(args.path, filler_rows=args.filler_rows)
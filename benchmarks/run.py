@@ -0,0 +1,291 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import models
+import profiles
+import sim
+import tables
+
+from benchmarks import fixture
+
+
+FORMAT_VERSION = 1
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Rounds per benchmark; results are the median round.
+DEFAULT_REPEAT = 15
+
+# A result is flagged when it is more than 1 + this many times slower than
+# the baseline. Back-to-back runs of an unchanged tree on a shared machine
+# have differed by up to a factor of 1.9, so only a clear slowdown counts.
+DEFAULT_THRESHOLD = 1.0
+
+HOME_TEAM = ('NYA', 2019)
+AWAY_TEAM = ('BOS', 2019)
+
+
+class BenchmarkResult(object):
+
+    def __init__(self, name, value, unit, higher_is_better=False):
+        self.name = name
+        self.value = value
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def as_dict(self):
+        return {
+            'value': self.value,
+            'unit': self.unit,
+            'higher_is_better': self.higher_is_better,
+        }
+
+
+def _time_calls(func, repeat, number=1):
+    # Median per-call time over several rounds; unlike the best round it is
+    # not moved by one lucky or unlucky round on a shared machine.
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return statistics.median(timings)
+
+
+def _get_team(team_id, year):
+    return models.Teams.get(teamID=team_id, yearID=year)
+
+
+def bench_filters(repeat):
+    team = _get_team(*HOME_TEAM)
+    lookups = [
+        (models.Teams, {'yearID': HOME_TEAM[1], 'teamID': HOME_TEAM[0]}),
+        (models.Players, {'playerID': models.BattingStats.filter(team_ID=team.id)[0].playerID}),
+        (models.BattingStats, {'team_ID': team.id}),
+        (models.PitchingStats, {'team_ID': team.id}),
+        (models.FieldingStats, {'team_ID': team.id}),
+        (models.PlateAppearances, {'team_ID': team.id}),
+    ]
+    results = []
+    for table, lookup in lookups:
+        # Time the query itself, not the result cache in front of it.
+        cache_stats = table.get_cache_stats()
+        table.disable_cache()
+        try:
+            seconds = _time_calls(lambda: table.filter(**lookup), repeat, number=100)
+        finally:
+            if cache_stats['enabled']:
+                table.enable_cache(cache_stats['size'])
+        results.append(
+            BenchmarkResult('filter.{}'.format(table.table_name), seconds * 1e6, 'us')
+        )
+    return results
+
+
+def _invalidate_tables():
+    for table in list(tables.Table._registry.values()):
+        table.invalidate()
+
+
+def bench_lineups(repeat):
+    def get_starters():
+        _invalidate_tables()
+        _get_team(*HOME_TEAM).get_starters()
+
+    def build_lineup():
+        _invalidate_tables()
+        models.Lineup(_get_team(*HOME_TEAM), designated_hitter=True)
+
+    return [
+        BenchmarkResult('team.get_starters', _time_calls(get_starters, repeat) * 1e3, 'ms'),
+        BenchmarkResult('lineup.build', _time_calls(build_lineup, repeat) * 1e3, 'ms'),
+    ]
+
+
+def _get_profiles():
+    return (
+        profiles.get_team_profile(_get_team(*HOME_TEAM)),
+        profiles.get_team_profile(_get_team(*AWAY_TEAM)),
+    )
+
+
+def bench_plate_appearances(repeat, num_plate_appearances=20000):
+    home_profile, away_profile = _get_profiles()
+
+    def simulate():
+        game = sim.Game(home_profile, away_profile, 0, listener=sim.NullListener(), seed=0)
+        game.start_game()
+        pitcher = game.get_current_pitcher()
+        for _ in range(num_plate_appearances):
+            game.simulate_plate_appearance(game.get_current_batter(), pitcher)
+            if game.outs >= 3:
+                game.outs = 0
+                game.clear_bases()
+
+    seconds = _time_calls(simulate, repeat)
+    return [
+        BenchmarkResult(
+            'game.plate_appearances_per_second',
+            num_plate_appearances / seconds,
+            'PA/s',
+            higher_is_better=True,
+        ),
+    ]
+
+
+def bench_games(repeat, num_games=500):
+    home_profile, away_profile = _get_profiles()
+    listener = sim.NullListener()
+
+    def simulate():
+        for game_idx in range(num_games):
+            sim.Game(home_profile, away_profile, 0, listener=listener, seed=game_idx).simulate()
+
+    seconds = _time_calls(simulate, repeat)
+    return [
+        BenchmarkResult('game.games_per_second', num_games / seconds, 'games/s', higher_is_better=True),
+    ]
+
+
+def bench_memory(num_games=20):
+    home_profile, away_profile = _get_profiles()
+    listener = sim.NullListener()
+    sim.Game(home_profile, away_profile, 0, listener=listener, seed=0).simulate()
+
+    peaks = []
+    for game_idx in range(num_games):
+        gc.collect()
+        tracemalloc.start()
+        sim.Game(home_profile, away_profile, 0, listener=listener, seed=game_idx).simulate()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return [
+        BenchmarkResult('game.peak_memory', sum(peaks) / len(peaks) / 1024, 'KiB'),
+    ]
+
+
+def run_benchmarks(database_filename, repeat=DEFAULT_REPEAT):
+    tables.configure(database_filename, cache_filename=None)
+    results = []
+    results.extend(bench_filters(repeat))
+    results.extend(bench_lineups(repeat))
+    results.extend(bench_plate_appearances(repeat))
+    results.extend(bench_games(repeat))
+    results.extend(bench_memory())
+    return results
+
+
+def get_report(results):
+    return {
+        'version': FORMAT_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': {result.name: result.as_dict() for result in results},
+    }
+
+
+def compare(report, baseline, threshold=DEFAULT_THRESHOLD):
+    # Returns (name, baseline value, value, relative change, regressed) for
+    # every benchmark in both reports; change is the speedup over the
+    # baseline minus one, so it is positive when faster. A benchmark regresses
+    # when it is more than 1 + threshold times slower, measured the same way
+    # for times and for rates.
+    comparisons = []
+    for name, result in sorted(report['results'].items()):
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None or not baseline_result['value'] or not result['value']:
+            continue
+        speedup = result['value'] / baseline_result['value']
+        if not result['higher_is_better']:
+            speedup = 1 / speedup
+        comparisons.append((
+            name,
+            baseline_result['value'],
+            result['value'],
+            speedup - 1,
+            speedup * (1 + threshold) < 1,
+        ))
+    return comparisons
+
+
+def print_report(report):
+    for name, result in sorted(report['results'].items()):
+        print('{:<36}{:>14.2f} {}'.format(name, result['value'], result['unit']))
+
+
+def print_comparison(comparisons):
+    print('{:<36}{:>14}{:>14}{:>9}'.format('Benchmark', 'Baseline', 'Current', 'Change'))
+    for name, baseline_value, value, change, regressed in comparisons:
+        print('{:<36}{:>14.2f}{:>14.2f}{:>+8.1%}{}'.format(
+            name,
+            baseline_value,
+            value,
+            change,
+            '  REGRESSION' if regressed else '',
+        ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--database',
+        action='store',
+        default=None,
+    )
+    parser.add_argument(
+        '--repeat',
+        action='store',
+        type=int,
+        default=DEFAULT_REPEAT,
+    )
+    parser.add_argument(
+        '--output',
+        action='store',
+        default=None,
+    )
+    parser.add_argument(
+        '--baseline',
+        action='store',
+        default=BASELINE_FILENAME,
+    )
+    parser.add_argument(
+        '--threshold',
+        action='store',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database_filename = args.database
+        if database_filename is None:
+            database_filename = fixture.build_fixture(os.path.join(temp_dir, 'fixture.sqlite'))
+        report = get_report(run_benchmarks(database_filename, args.repeat))
+        tables.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    compare_baseline = args.baseline and os.path.exists(args.baseline)
+    if compare_baseline and args.output:
+        # Writing a new baseline over the old one.
+        compare_baseline = os.path.abspath(args.baseline) != os.path.abspath(args.output)
+    if compare_baseline:
+        with open(args.baseline) as f:
+            comparisons = compare(report, json.load(f), args.threshold)
+        print_comparison(comparisons)
+        if any(regressed for _, _, _, _, regressed in comparisons):
+            sys.exit(1)
+    else:
+        print_report(report)
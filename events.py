@@ -1,20 +1,435 @@
-class InningEvent(object):
+import queue
+import threading
+import time
+
+
+FIRST_BASE = 0
+SECOND_BASE = 1
+THIRD_BASE = 2
+HOME_RUN = 3
+
+# Plate appearance outcomes as recorded in PlateAppearanceEvent.
+OUTCOME_WALK = 0
+OUTCOME_STRIKEOUT = 1
+OUTCOME_SINGLE = 2
+OUTCOME_DOUBLE = 3
+OUTCOME_TRIPLE = 4
+OUTCOME_HOME_RUN = 5
+OUTCOME_GROUND_OUT = 6
+OUTCOME_FLY_OUT = 7
+
+HIT_VERBS = {
+    FIRST_BASE: 'singles',
+    SECOND_BASE: 'doubles',
+    THIRD_BASE: 'triples',
+    HOME_RUN: 'hits a home-run'
+}
+
+
+class Event(object):
+
+    __slots__ = ()
+
+    def render(self):
+        return None
+
+    def __str__(self):
+        text = self.render()
+        if text is None:
+            return '<{}>'.format(type(self).__name__)
+        return text
+
+
+class InningEvent(Event):
+
+    __slots__ = ('inning_half', 'inning_num', )
 
     def __init__(self, inning_half, inning_num):
         self.inning_half = inning_half
         self.inning_num = inning_num
 
+    def render(self):
+        return '\n-- {} of Inning {} --\n'.format(self.inning_half.title(), self.inning_num)
 
-class OutEvent(object):
+
+class OutEvent(Event):
+
+    __slots__ = ('num_outs', )
 
     def __init__(self, num_outs):
         self.num_outs = num_outs
 
 
-class ScoreEvent(object):
+class ScoreEvent(Event):
+
+    __slots__ = ('away_team', 'away_score', 'home_team', 'home_score', )
 
     def __init__(self, away_team, away_score, home_team, home_score):
         self.away_team = away_team
         self.away_score = away_score
         self.home_team = home_team
         self.home_score = home_score
+
+
+class WalkEvent(Event):
+
+    __slots__ = ('batter', 'pitcher', )
+
+    def __init__(self, batter, pitcher):
+        self.batter = batter
+        self.pitcher = pitcher
+
+    def render(self):
+        return '{} walks {}'.format(self.pitcher.name, self.batter.name)
+
+
+class StrikeoutEvent(Event):
+
+    __slots__ = ('batter', 'pitcher', )
+
+    def __init__(self, batter, pitcher):
+        self.batter = batter
+        self.pitcher = pitcher
+
+    def render(self):
+        return '{} strikes-out {}'.format(self.pitcher.name, self.batter.name)
+
+
+class HitEvent(Event):
+
+    __slots__ = ('batter', 'pitcher', 'hit_type', )
+
+    def __init__(self, batter, pitcher, hit_type):
+        self.batter = batter
+        self.pitcher = pitcher
+        self.hit_type = hit_type
+
+    def render(self):
+        return '{} {} off {}'.format(self.batter.name, HIT_VERBS[self.hit_type], self.pitcher.name)
+
+
+class BattedOutEvent(Event):
+
+    __slots__ = ('batter', 'out_type', )
+
+    def __init__(self, batter, out_type):
+        self.batter = batter
+        self.out_type = out_type
+
+    def render(self):
+        return '{} {}'.format(self.batter.name, self.out_type)
+
+
+class PlateAppearanceEvent(Event):
+    # Bases are a mask of occupied bases: bit 0 first, bit 1 second, bit 2
+    # third. Outs are the count after the plate appearance. Each team uses one
+    # pitcher per game, so the pitcher follows from the inning half.
+
+    __slots__ = (
+        'inning', 'inning_half', 'batter_idx', 'outcome',
+        'bases_before', 'bases_after', 'outs', 'runs',
+    )
+
+    def __init__(self, inning, inning_half, batter_idx, outcome,
+                 bases_before, bases_after, outs, runs):
+        self.inning = inning
+        self.inning_half = inning_half
+        self.batter_idx = batter_idx
+        self.outcome = outcome
+        self.bases_before = bases_before
+        self.bases_after = bases_after
+        self.outs = outs
+        self.runs = runs
+
+
+class RunsScoredEvent(Event):
+    # scorers are the batters who crossed the plate, lead runner first.
+
+    __slots__ = ('runs', 'away_team', 'away_score', 'home_team', 'home_score', 'scorers', )
+
+    def __init__(self, runs, away_team, away_score, home_team, home_score, scorers=()):
+        self.runs = runs
+        self.away_team = away_team
+        self.away_score = away_score
+        self.home_team = home_team
+        self.home_score = home_score
+        self.scorers = scorers
+
+    def render(self):
+        if self.runs == 1:
+            runs = '1 run scores'
+        else:
+            runs = '{} runs score'.format(self.runs)
+        return '{}\n{} {} - {} {}'.format(
+            runs,
+            self.away_team,
+            self.away_score,
+            self.home_team,
+            self.home_score,
+        )
+
+
+class GameOverEvent(Event):
+
+    __slots__ = ('winning_team', )
+
+    def __init__(self, winning_team):
+        self.winning_team = winning_team
+
+    def render(self):
+        return '\n{} win!\n'.format(self.winning_team)
+
+
+class BoxScoreEvent(Event):
+
+    # lines holds the game's per-player statlines.StatLines, if provided.
+
+    __slots__ = ('away_team', 'away_stats', 'home_team', 'home_stats', 'lines', )
+
+    def __init__(self, away_team, away_stats, home_team, home_stats, lines=None):
+        self.away_team = away_team
+        self.away_stats = away_stats
+        self.home_team = home_team
+        self.home_stats = home_stats
+        self.lines = lines
+
+    def _render_team_line(self, team_id, stats):
+        per_inning_runs = ''.join(['{:>5}'.format(x['runs']) for x in stats['box_score']])
+        return '{} {}{:>5}{:>5}{:>5}'.format(
+            team_id,
+            per_inning_runs,
+            stats['runs'],
+            stats['hits'],
+            stats['errors'],
+        )
+
+    def render(self):
+        num_innings = len(self.away_stats['box_score']) + 1
+        box_score_header = 'Team    1    2    3    4    5    6    7    8    9'
+        if num_innings > 9:
+            for i in range(10, num_innings):
+                box_score_header += '{:>5}'.format(i)
+        box_score_header += '    R    H    E'
+        return '\n'.join([
+            box_score_header,
+            self._render_team_line(self.away_team, self.away_stats),
+            self._render_team_line(self.home_team, self.home_stats),
+        ])
+
+
+EVENT_TYPES = (
+    InningEvent,
+    OutEvent,
+    ScoreEvent,
+    WalkEvent,
+    StrikeoutEvent,
+    HitEvent,
+    BattedOutEvent,
+    PlateAppearanceEvent,
+    RunsScoredEvent,
+    GameOverEvent,
+    BoxScoreEvent,
+)
+
+# Events that render play-by-play text.
+TEXT_EVENTS = (
+    InningEvent,
+    WalkEvent,
+    StrikeoutEvent,
+    HitEvent,
+    BattedOutEvent,
+    RunsScoredEvent,
+    GameOverEvent,
+    BoxScoreEvent,
+)
+
+
+def get_subscriptions(listener):
+    # A listener may declare the event types it handles as `event_types`;
+    # anything else is never constructed for it.
+    event_types = getattr(listener, 'event_types', None)
+    if event_types is None:
+        return {event_type: True for event_type in EVENT_TYPES}
+    event_types = tuple(event_types)
+    return {
+        event_type: issubclass(event_type, event_types) if event_types else False
+        for event_type in EVENT_TYPES
+    }
+
+
+class Subscription(object):
+
+    def __init__(self, handler, event_types, buffer_size):
+        self.handler = handler
+        self.event_types = event_types
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.events = 0
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.lagged_calls = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def handles(self, event_type):
+        return self.event_types is None or issubclass(event_type, self.event_types)
+
+    def add(self, event, published):
+        if not self.buffer_size:
+            self.deliver(event, 1, published)
+            return
+        self.buffer.append(event)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush(published)
+
+    def flush(self, published=None):
+        if self.buffer:
+            buffered = self.buffer
+            self.buffer = []
+            self.deliver(buffered, len(buffered), published)
+
+    def deliver(self, payload, num_events, published):
+        start = time.perf_counter()
+        self.handler(payload)
+        end = time.perf_counter()
+        self.events += num_events
+        self.calls += 1
+        self.total_time += end - start
+        self.max_time = max(self.max_time, end - start)
+        if published is not None:
+            self.lagged_calls += 1
+            self.total_lag += start - published
+            self.max_lag = max(self.max_lag, start - published)
+
+    def get_stats(self):
+        calls = self.calls or 1
+        return {
+            'events': self.events,
+            'calls': self.calls,
+            'total_time': self.total_time,
+            'mean_time': self.total_time / calls,
+            'max_time': self.max_time,
+            # Final flushes have no publish time, so they add no lag.
+            'mean_lag': self.total_lag / (self.lagged_calls or 1),
+            'max_lag': self.max_lag,
+        }
+
+
+class EventBus(object):
+    # Fans events out to any number of subscribers. A subscriber only sees
+    # the event types it asked for; with a buffer_size its handler is called
+    # with lists of events instead of one event at a time. In background
+    # mode events are queued in chunks and delivered on a consumer thread,
+    # so the simulation loop only pays for an append.
+
+    def __init__(self, background=False, chunk_size=256, max_chunks=64):
+        self.subscriptions = []
+        self._routes = {}
+        self.background = background
+        self.chunk_size = chunk_size
+        self._chunk = []
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if background:
+            self._queue = queue.Queue(maxsize=max_chunks)
+            self._thread = threading.Thread(target=self._consume, daemon=True)
+            self._thread.start()
+
+    @property
+    def event_types(self):
+        # Union of what the subscribers handle, so a Game publishing to the
+        # bus skips events no subscriber wants.
+        event_types = set()
+        for subscription in self.subscriptions:
+            if subscription.event_types is None:
+                return None
+            event_types.update(subscription.event_types)
+        return tuple(event_types)
+
+    def subscribe(self, handler, event_types=None, buffer_size=0):
+        if not callable(handler):
+            if event_types is None:
+                event_types = getattr(handler, 'event_types', None)
+            handler = handler.on_event
+        if event_types is not None:
+            event_types = tuple(event_types)
+        subscription = Subscription(handler, event_types, buffer_size)
+        self.subscriptions.append(subscription)
+        self._routes = {}
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.flush()
+        self.subscriptions.remove(subscription)
+        self._routes = {}
+
+    def _get_route(self, event_type):
+        route = self._routes.get(event_type)
+        if route is None:
+            route = [x for x in self.subscriptions if x.handles(event_type)]
+            self._routes[event_type] = route
+        return route
+
+    def on_event(self, event):
+        if self._queue is None:
+            self._dispatch(event, None)
+            return
+        self._chunk.append(event)
+        if len(self._chunk) >= self.chunk_size:
+            self._put_chunk()
+
+    def _dispatch(self, event, published):
+        for subscription in self._get_route(type(event)):
+            subscription.add(event, published)
+
+    def _put_chunk(self):
+        if self._error is not None:
+            raise RuntimeError('Event consumer failed: {}'.format(self._error))
+        chunk = self._chunk
+        self._chunk = []
+        self._queue.put((time.perf_counter(), chunk))
+
+    def _consume(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                published, chunk = item
+                if self._error is None:
+                    for event in chunk:
+                        self._dispatch(event, published)
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _flush_subscriptions(self):
+        for subscription in self.subscriptions:
+            subscription.flush()
+
+    def flush(self):
+        if self._queue is None:
+            self._flush_subscriptions()
+            return
+        if self._chunk:
+            self._put_chunk()
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError('Event consumer failed: {}'.format(self._error))
+        # Buffers are only touched by the consumer thread, which is idle
+        # once the queue has drained.
+        self._flush_subscriptions()
+
+    def close(self):
+        self.flush()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._queue = None
+
+    def get_stats(self):
+        return [(x.handler, x.get_stats()) for x in self.subscriptions]
@@ -0,0 +1,242 @@
+import argparse
+import mmap
+import struct
+from collections import Counter
+
+import numpy as np
+
+import events
+
+
+MAGIC = b'BSGL'
+VERSION = 2
+
+# File header: magic, format version, record size.
+HEADER = struct.Struct('<4sHH8x')
+
+# One plate appearance: game id, inning, half, batter index, outcome, bases
+# before/after, outs and runs, padded to 16 bytes.
+RECORD = struct.Struct('<IHBBBBBBBxxx')
+
+RECORD_DTYPE = np.dtype([
+    ('game_id', '<u4'),
+    ('inning', '<u2'),
+    ('half', 'u1'),
+    ('batter_idx', 'u1'),
+    ('outcome', 'u1'),
+    ('bases_before', 'u1'),
+    ('bases_after', 'u1'),
+    ('outs', 'u1'),
+    ('runs', 'u1'),
+    ('padding', 'V3'),
+])
+
+RECORD_FIELDS = RECORD_DTYPE.names[:-1]
+
+OUTCOME_NAMES = {
+    events.OUTCOME_WALK: 'walk',
+    events.OUTCOME_STRIKEOUT: 'strikeout',
+    events.OUTCOME_SINGLE: 'single',
+    events.OUTCOME_DOUBLE: 'double',
+    events.OUTCOME_TRIPLE: 'triple',
+    events.OUTCOME_HOME_RUN: 'home-run',
+    events.OUTCOME_GROUND_OUT: 'ground-out',
+    events.OUTCOME_FLY_OUT: 'fly-out',
+}
+
+FLUSH_SIZE = 4096
+
+
+class GameLogWriter(object):
+    # Listener that appends a record for every plate appearance. The game id
+    # advances on each GameOverEvent, so one writer can log a whole batch.
+
+    event_types = (events.PlateAppearanceEvent, events.GameOverEvent, )
+
+    def __init__(self, path, game_id=0):
+        self.path = path
+        self.game_id = game_id
+        self.num_records = 0
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+        self._buffer = bytearray(RECORD.size * FLUSH_SIZE)
+        self._offset = 0
+
+    def on_event(self, event):
+        if type(event) is events.GameOverEvent:
+            self.game_id += 1
+            return
+        RECORD.pack_into(
+            self._buffer,
+            self._offset,
+            self.game_id,
+            event.inning,
+            event.inning_half,
+            event.batter_idx,
+            event.outcome,
+            event.bases_before,
+            event.bases_after,
+            event.outs,
+            event.runs,
+        )
+        self._offset += RECORD.size
+        self.num_records += 1
+        if self._offset == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        if self._offset:
+            self._file.write(memoryview(self._buffer)[:self._offset])
+            self._offset = 0
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class GameLogRecord(object):
+    # Decodes fields on access from a view into the mapped file.
+
+    __slots__ = ('view', )
+
+    def __init__(self, view):
+        self.view = view
+
+    def values(self):
+        return RECORD.unpack_from(self.view)
+
+    def as_dict(self):
+        return dict(zip(RECORD_FIELDS, self.values()))
+
+    def __getattr__(self, name):
+        try:
+            idx = RECORD_FIELDS.index(name)
+        except ValueError:
+            raise AttributeError(name)
+        return self.values()[idx]
+
+    def __repr__(self):
+        return '<GameLogRecord {}>'.format(self.as_dict())
+
+
+class GameLogReader(object):
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise RuntimeError('{} is not a game log'.format(path))
+        if version != VERSION or record_size != RECORD.size:
+            raise RuntimeError(
+                '{} has log format {} (record size {}), expected {} ({})'.format(
+                    path, version, record_size, VERSION, RECORD.size,
+                )
+            )
+        self._view = memoryview(self._mmap)[HEADER.size:]
+        self._num_records = len(self._view) // RECORD.size
+        self._records = None
+
+    def __len__(self):
+        return self._num_records
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self._num_records
+        if not 0 <= idx < self._num_records:
+            raise IndexError(idx)
+        offset = idx * RECORD.size
+        return GameLogRecord(self._view[offset:offset + RECORD.size])
+
+    def __iter__(self):
+        for idx in range(self._num_records):
+            yield self[idx]
+
+    @property
+    def records(self):
+        # Structured array over the mapped file; no records are copied.
+        if self._records is None:
+            self._records = np.frombuffer(
+                self._view,
+                dtype=RECORD_DTYPE,
+                count=self._num_records,
+            )
+        return self._records
+
+    def filter(self, **criteria):
+        mask = np.ones(self._num_records, dtype=bool)
+        for name, value in criteria.items():
+            if name not in RECORD_FIELDS:
+                raise RuntimeError('Unknown game log field: {}'.format(name))
+            mask &= self.records[name] == value
+        return self.records[mask]
+
+    def close(self):
+        if self._mmap is not None:
+            self._records = None
+            try:
+                self._view.release()
+                self._mmap.close()
+            except BufferError:
+                # Arrays handed out still map the file; it is unmapped once
+                # they are collected.
+                pass
+            self._file.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def summarize(reader):
+    records = reader.records
+    outcomes = Counter(records['outcome'].tolist())
+    num_games = len(np.unique(records['game_id']))
+    lines = [
+        '{} plate appearances in {} games'.format(len(records), num_games),
+        'Runs: {}'.format(int(records['runs'].sum())),
+    ]
+    for outcome, name in sorted(OUTCOME_NAMES.items()):
+        lines.append('{:<12}{:>10}'.format(name, outcomes[outcome]))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path', action='store')
+    parser.add_argument(
+        '--game',
+        action='store',
+        type=int,
+        default=None,
+    )
+    args = parser.parse_args()
+
+    with GameLogReader(args.path) as reader:
+        if args.game is None:
+            print(summarize(reader))
+        else:
+            for record in reader.filter(game_id=args.game):
+                print('{:>3} {:<7} {} {:<12} {:03b} -> {:03b}  outs {}  runs {}'.format(
+                    record['inning'],
+                    'top' if record['half'] == 0 else 'bottom',
+                    record['batter_idx'] + 1,
+                    OUTCOME_NAMES[record['outcome']],
+                    record['bases_before'],
+                    record['bases_after'],
+                    record['outs'],
+                    record['runs'],
+                ))
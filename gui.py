@@ -1,3 +1,4 @@
+import queue
 import tkinter as tk
 from tkinter import ttk
 from threading import Thread
@@ -10,6 +11,12 @@ import models
 from sim import Game
 
 
+# How often the Tk main loop drains events published by the game thread, and
+# the most it handles in one pass so a burst never stalls the window.
+POLL_INTERVAL_MS = 50
+MAX_EVENTS_PER_POLL = 2000
+
+
 class DataApi(object):
 
     @classmethod
@@ -59,6 +66,8 @@ class ConfigView(object):
 
     def __init__(self, canvas, play_by_play):
         self.play_by_play = play_by_play
+        self.event_bus = events.EventBus()
+        self.play_by_play.subscribe(self.event_bus)
         self.away_select = TeamSelect(canvas, 'Away', 0)
         self.home_select = TeamSelect(canvas, 'Home', 2)
         self.start_button = ttk.Button(canvas, text='Play Ball', command=self.start_game)
@@ -82,7 +91,7 @@ class ConfigView(object):
             home_team,
             away_team,
             time_step,
-            listener=self.play_by_play,
+            listener=self.event_bus,
         )
         self.game.simulate()
 
@@ -96,6 +105,25 @@ class FieldView(object):
         self.field_label.grid(column=3, row=0, columnspan=20, rowspan=8)
 
 
+class LatestEvent(object):
+    # Holds the most recent event of one type. set() runs on the game thread;
+    # update() runs on the Tk thread and redraws only if a newer event came.
+
+    def __init__(self, on_change):
+        self.on_change = on_change
+        self.event = None
+        self.shown = None
+
+    def set(self, event):
+        self.event = event
+
+    def update(self):
+        event = self.event
+        if event is not self.shown:
+            self.shown = event
+            self.on_change(event)
+
+
 class PlayByPlayView(object):
 
     def __init__(self, canvas):
@@ -118,6 +146,12 @@ class PlayByPlayView(object):
         self.score_label['textvariable'] = self.score
         self.score_label.grid(column=10, row=8)
 
+        self.latest_inning = LatestEvent(self.on_inning)
+        self.latest_outs = LatestEvent(self.on_outs)
+        self.latest_score = LatestEvent(self.on_score)
+        self.pending = queue.Queue()
+        self.console_text.after(POLL_INTERVAL_MS, self.poll)
+
     def get_inning_suffix(self, inning_num):
         SUFFIXES = ['', 'st', 'nd', 'rd', ]
         if inning_num < len(SUFFIXES):
@@ -125,37 +159,71 @@ class PlayByPlayView(object):
         else:
             return 'th'
 
-    def on_event(self, event):
-        if isinstance(event, events.InningEvent):
-            self.inning.set(
-                '{}{} {}'.format(
-                    event.inning_num,
-                    self.get_inning_suffix(event.inning_num),
-                    event.inning_half.title(),
-                )
-            )
-        elif isinstance(event, events.OutEvent):
-            if event.num_outs == 1:
-                self.outs.set('1 out')
-            else:
-                self.outs.set('{} outs'.format(event.num_outs))
-        elif isinstance(event, events.ScoreEvent):
-            self.score.set(
-                '{} {} - {} {}'.format(
-                    event.away_team,
-                    event.away_score,
-                    event.home_team,
-                    event.home_score,
-                )
+    def subscribe(self, bus):
+        # The handlers run on the game thread as events are published and
+        # only store them; widgets are touched in poll(), on the Tk thread.
+        bus.subscribe(self.latest_inning.set, (events.InningEvent, ))
+        bus.subscribe(self.latest_outs.set, (events.OutEvent, ))
+        bus.subscribe(self.latest_score.set, (events.ScoreEvent, ))
+        bus.subscribe(self.pending.put, events.TEXT_EVENTS)
+
+    def poll(self):
+        # Only the latest label values matter after a burst.
+        self.latest_inning.update()
+        self.latest_outs.update()
+        self.latest_score.update()
+
+        lines = []
+        for _ in range(MAX_EVENTS_PER_POLL):
+            try:
+                event = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            text = event.render()
+            if text is not None:
+                lines.append(text)
+        if lines:
+            self.add_text('\n'.join(lines))
+
+        self.console_text.after(POLL_INTERVAL_MS, self.poll)
+
+    def on_inning(self, event):
+        self.inning.set(
+            '{}{} {}'.format(
+                event.inning_num,
+                self.get_inning_suffix(event.inning_num),
+                event.inning_half.title(),
             )
+        )
+
+    def on_outs(self, event):
+        if event.num_outs == 1:
+            self.outs.set('1 out')
         else:
-            event_msg = event
-            self.console_text.config(state=tk.NORMAL)
-            self.console_text.insert(tk.END, event_msg + '\n')
-            self.console_text.see(tk.END)
-            self.console_text.config(state=tk.DISABLED)
+            self.outs.set('{} outs'.format(event.num_outs))
+
+    def on_score(self, event):
+        self.score.set(
+            '{} {} - {} {}'.format(
+                event.away_team,
+                event.away_score,
+                event.home_team,
+                event.home_score,
+            )
+        )
+
+    def add_text(self, text):
+        self.console_text.config(state=tk.NORMAL)
+        self.console_text.insert(tk.END, text + '\n')
+        self.console_text.see(tk.END)
+        self.console_text.config(state=tk.DISABLED)
 
     def clear_console(self):
+        while True:
+            try:
+                self.pending.get_nowait()
+            except queue.Empty:
+                break
         self.console_text.config(state=tk.NORMAL)
         self.console_text.delete(1.0, tk.END)
         self.console_text.config(state=tk.DISABLED)
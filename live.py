@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import time
+
+import models
+import profiles
+import sim
+
+
+class GameClock(object):
+    # Paces a live game on an asyncio loop. A time_step of zero (or a paused
+    # game resumed at that speed) runs plate appearances back to back.
+
+    def __init__(self, time_step, speed=1.0):
+        self.time_step = time_step
+        self.speed = speed
+        self.paused = False
+        self._resumed = None
+        self._changed = None
+
+    def _get_delay(self):
+        if not self.time_step:
+            return 0
+        return self.time_step / self.speed
+
+    def _notify(self):
+        if self._changed is not None:
+            self._changed.set()
+
+    def pause(self):
+        self.paused = True
+        if self._resumed is not None:
+            self._resumed.clear()
+
+    def resume(self):
+        self.paused = False
+        if self._resumed is not None:
+            self._resumed.set()
+        self._notify()
+
+    def set_speed(self, speed):
+        if speed <= 0:
+            raise RuntimeError('Clock speed must be positive, got {}'.format(speed))
+        self.speed = speed
+        # Cut short the current wait so the new speed applies immediately.
+        self._notify()
+
+    async def _wait_resumed(self):
+        if self._resumed is None:
+            self._resumed = asyncio.Event()
+        if self.paused:
+            self._resumed.clear()
+            await self._resumed.wait()
+
+    async def tick(self):
+        await self._wait_resumed()
+        delay = self._get_delay()
+        if not delay:
+            return
+
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        deadline = time.monotonic() + delay
+        while True:
+            self._changed.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if self.paused:
+                await self._wait_resumed()
+                deadline = time.monotonic() + self._get_delay()
+            else:
+                deadline = deadline - delay + self._get_delay()
+                delay = self._get_delay()
+
+
+class AsyncGame(sim.Game):
+
+    def __init__(self, home_team, away_team, time_step, listener=None, rng=None, clock=None,
+                 seed=None, key=(), game_idx=0):
+        super(AsyncGame, self).__init__(
+            home_team,
+            away_team,
+            time_step,
+            listener=listener,
+            rng=rng,
+            seed=seed,
+            key=key,
+            game_idx=game_idx,
+        )
+        self.clock = clock if clock is not None else GameClock(time_step)
+
+    def pause(self):
+        self.clock.pause()
+
+    def resume(self):
+        self.clock.resume()
+
+    def set_speed(self, speed):
+        self.clock.set_speed(speed)
+
+    async def simulate(self):
+        clock = self.clock
+        for _ in self.play():
+            if clock.time_step or clock.paused:
+                await clock.tick()
+            elif self.outs >= 3:
+                # Instant games still hand the loop back once a half inning,
+                # so other games progress and a pause can take effect.
+                await asyncio.sleep(0)
+        return self
+
+
+async def simulate_games(games):
+    return await asyncio.gather(*[game.simulate() for game in games])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('home', action='store')
+    parser.add_argument('home_year', action='store')
+    parser.add_argument('away', action='store')
+    parser.add_argument('away_year', action='store')
+    parser.add_argument(
+        '--time_step',
+        action='store',
+        type=float,
+        default=0.5
+    )
+    parser.add_argument(
+        '--games',
+        action='store',
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--seed',
+        action='store',
+        type=int,
+        default=None,
+    )
+    args = parser.parse_args()
+
+    home_team = profiles.get_team_profile(
+        models.Teams.filter(yearId=args.home_year, teamId=args.home)[0]
+    )
+    away_team = profiles.get_team_profile(
+        models.Teams.filter(yearId=args.away_year, teamId=args.away)[0]
+    )
+
+    # Only the first game is narrated; the others run silently alongside it.
+    games = [AsyncGame(home_team, away_team, args.time_step, seed=args.seed)]
+    for game_idx in range(1, args.games):
+        games.append(AsyncGame(
+            home_team,
+            away_team,
+            args.time_step,
+            listener=sim.NullListener(),
+            seed=args.seed,
+            game_idx=game_idx,
+        ))
+
+    start = time.perf_counter()
+    asyncio.run(simulate_games(games))
+    if args.games > 1:
+        print('\n{} concurrent games in {:.1f}s'.format(args.games, time.perf_counter() - start))
+        for game in games:
+            print('{} {} - {} {}'.format(
+                away_team.teamID,
+                game.stats['away']['runs'],
+                home_team.teamID,
+                game.stats['home']['runs'],
+            ))
@@ -0,0 +1,270 @@
+import argparse
+import time
+
+import numpy as np
+
+import basestate
+import batch
+import models
+import profiles
+from matchups import get_hit_type_probabilities, get_outcome_probabilities
+
+
+NUM_BATTERS = 9
+NUM_BASE_OUT_STATES = 24
+# Index of the absorbing "three outs" state, after the 24 base-out states.
+INNING_OVER = NUM_BASE_OUT_STATES
+NUM_STATES = NUM_BASE_OUT_STATES + 1
+
+# Most runs that can score on one plate appearance (grand slam).
+MAX_RUNS_PER_PLAY = 4
+
+MAX_INNING_RUNS = 30
+MAX_RUN_DIFFERENTIAL = 40
+REGULATION_INNINGS = 9
+TOLERANCE = 1e-12
+
+
+def get_state(outs, bases):
+    return outs * 8 + bases
+
+
+def build_transitions(team_profile, pitcher):
+    # transitions[batter, runs, from_state, to_state]
+    transitions = np.zeros((NUM_BATTERS, MAX_RUNS_PER_PLAY + 1, NUM_STATES, NUM_STATES))
+    for batter_idx, batter in enumerate(team_profile.batting_order):
+        walk, strikeout, hit, out = get_outcome_probabilities(batter, pitcher)
+        hit_types = get_hit_type_probabilities(batter)
+        for outs in range(3):
+            for bases in range(basestate.NUM_BASE_STATES):
+                state = get_state(outs, bases)
+                matrix = transitions[batter_idx]
+
+                transition = basestate.WALK_TRANSITIONS[bases]
+                next_state = get_state(outs, transition.next_bases)
+                matrix[transition.runs, state, next_state] += walk
+
+                for hit_type, hit_type_pct in enumerate(hit_types):
+                    transition = basestate.HIT_TRANSITIONS[hit_type][bases]
+                    next_state = get_state(outs, transition.next_bases)
+                    matrix[transition.runs, state, next_state] += hit * hit_type_pct
+
+                if outs == 2:
+                    next_state = INNING_OVER
+                else:
+                    next_state = get_state(outs + 1, bases)
+                matrix[0, state, next_state] += strikeout + out
+    return transitions
+
+
+def get_half_inning_distributions(transitions):
+    # result[start, end, runs]: probability that an inning led off by batter
+    # `start` scores `runs` and hands the next inning to batter `end`.
+    result = np.zeros((NUM_BATTERS, NUM_BATTERS, MAX_INNING_RUNS + 1))
+    starts = np.arange(NUM_BATTERS)
+    mass = np.zeros((NUM_BATTERS, NUM_STATES, MAX_INNING_RUNS + 1))
+    mass[:, get_state(0, 0), 0] = 1.0
+
+    # Every step is one plate appearance, so the batter up is start + step.
+    step = 0
+    while mass.sum() > TOLERANCE and step < 1000:
+        matrices = transitions[(starts + step) % NUM_BATTERS]
+        moved = np.matmul(matrices.transpose(0, 1, 3, 2), mass[:, None])
+        new_mass = moved[:, 0].copy()
+        for runs in range(1, MAX_RUNS_PER_PLAY + 1):
+            new_mass[:, :, runs:] += moved[:, runs, :, :-runs]
+            new_mass[:, :, -1] += moved[:, runs, :, -runs:].sum(axis=2)
+
+        step += 1
+        ends = (starts + step) % NUM_BATTERS
+        result[starts, ends] += new_mass[:, INNING_OVER]
+        new_mass[:, INNING_OVER] = 0.0
+        mass = new_mass
+    return result
+
+
+def get_run_expectancy(transitions):
+    # Expected runs to the end of the inning from each (outs, bases, batter).
+    num_transient = NUM_BASE_OUT_STATES * NUM_BATTERS
+    matrix = np.zeros((num_transient, num_transient))
+    expected_runs = np.zeros(num_transient)
+    for batter_idx in range(NUM_BATTERS):
+        next_batter = (batter_idx + 1) % NUM_BATTERS
+        rows = slice(batter_idx * NUM_BASE_OUT_STATES, (batter_idx + 1) * NUM_BASE_OUT_STATES)
+        columns = slice(next_batter * NUM_BASE_OUT_STATES, (next_batter + 1) * NUM_BASE_OUT_STATES)
+        by_runs = transitions[batter_idx][:, :NUM_BASE_OUT_STATES, :NUM_BASE_OUT_STATES]
+        matrix[rows, columns] = by_runs.sum(axis=0)
+        runs = np.arange(MAX_RUNS_PER_PLAY + 1)[:, None, None]
+        expected_runs[rows] = (transitions[batter_idx][:, :NUM_BASE_OUT_STATES] * runs).sum(axis=(0, 2))
+    solution = np.linalg.solve(np.eye(num_transient) - matrix, expected_runs)
+    return solution.reshape(NUM_BATTERS, 3, 8).transpose(1, 2, 0)
+
+
+class GameSolution(object):
+
+    def __init__(self, home_team, away_team):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.home_win_pct = 0.0
+        self.away_win_pct = 0.0
+        self.extra_inning_pct = 0.0
+        self.unresolved_pct = 0.0
+        self.half_innings = {}
+        self.run_expectancy = {}
+        self.elapsed = 0.0
+
+    def get_inning_run_distribution(self, team_type, leadoff=0):
+        return self.half_innings[team_type][leadoff].sum(axis=0)
+
+    def __str__(self):
+        lines = ['{} at {} (exact)'.format(self.away_team.name, self.home_team.name)]
+        lines.append('{:<6}{:>8}{:>8}'.format('Team', 'Win%', 'R/Inn'))
+        teams = [
+            ('away', self.away_team, self.away_win_pct),
+            ('home', self.home_team, self.home_win_pct),
+        ]
+        for team_type, team, win_pct in teams:
+            distribution = self.get_inning_run_distribution(team_type)
+            lines.append('{:<6}{:>8.3f}{:>8.3f}'.format(
+                team.teamID,
+                win_pct,
+                (distribution * np.arange(len(distribution))).sum(),
+            ))
+        lines.append('Extra innings: {:.3f}'.format(self.extra_inning_pct))
+        lines.append('Solved in {:.1f}ms'.format(self.elapsed * 1000))
+        return '\n'.join(lines)
+
+
+def _play_half(distribution, half_inning, batting_axis, sign):
+    # distribution[away_idx, home_idx, differential]; differential is home
+    # runs minus away runs, offset by MAX_RUN_DIFFERENTIAL.
+    moved = np.moveaxis(distribution, batting_axis, 0)
+    scored = np.tensordot(half_inning, moved, axes=([0], [0]))
+    result = np.zeros_like(moved)
+    for runs in range(scored.shape[1]):
+        shift = sign * runs
+        by_runs = scored[:, runs]
+        if shift > 0:
+            result[:, :, shift:] += by_runs[:, :, :-shift]
+            result[:, :, -1] += by_runs[:, :, -shift:].sum(axis=2)
+        elif shift < 0:
+            result[:, :, :shift] += by_runs[:, :, -shift:]
+            result[:, :, 0] += by_runs[:, :, :-shift].sum(axis=2)
+        else:
+            result += by_runs
+    return np.moveaxis(result, 0, batting_axis)
+
+
+def _solve_extra_innings(tied, away_half_inning, home_half_inning):
+    # Extra innings always start tied, so the state is just who leads off for
+    # each team; the chance of each result is solved as an absorbing chain.
+    away_runs = away_half_inning.sum(axis=1)
+    home_runs = home_half_inning.sum(axis=1)
+    home_more = np.cumsum(home_runs[:, ::-1], axis=1)[:, ::-1]
+    home_more = np.concatenate([home_more[:, 1:], np.zeros((NUM_BATTERS, 1))], axis=1)
+    home_fewer = np.cumsum(home_runs, axis=1) - home_runs
+
+    home_wins = (away_runs @ home_more.T).reshape(-1)
+    away_wins = (away_runs @ home_fewer.T).reshape(-1)
+    still_tied = np.einsum('abr,hgr->ahbg', away_half_inning, home_half_inning)
+    still_tied = still_tied.reshape(NUM_BATTERS * NUM_BATTERS, NUM_BATTERS * NUM_BATTERS)
+
+    absorbing = np.eye(NUM_BATTERS * NUM_BATTERS) - still_tied
+    tied = tied.reshape(-1)
+    return (
+        tied @ np.linalg.solve(absorbing, home_wins),
+        tied @ np.linalg.solve(absorbing, away_wins),
+    )
+
+
+def _get_max_runs(*half_innings):
+    # Highest inning run total that any team reaches with meaningful odds.
+    max_runs = 0
+    for half_inning in half_innings:
+        scored = np.flatnonzero(half_inning.max(axis=(0, 1)) > TOLERANCE)
+        max_runs = max(max_runs, scored[-1])
+    return max_runs
+
+
+def solve_game(home_team, away_team):
+    start = time.perf_counter()
+    home_profile = profiles.get_team_profile(home_team)
+    away_profile = profiles.get_team_profile(away_team)
+    solution = GameSolution(home_profile, away_profile)
+
+    away_transitions = build_transitions(away_profile, home_profile.pitcher)
+    home_transitions = build_transitions(home_profile, away_profile.pitcher)
+    solution.half_innings = {
+        'away': get_half_inning_distributions(away_transitions),
+        'home': get_half_inning_distributions(home_transitions),
+    }
+    solution.run_expectancy = {
+        'away': get_run_expectancy(away_transitions),
+        'home': get_run_expectancy(home_transitions),
+    }
+    max_runs = _get_max_runs(solution.half_innings['away'], solution.half_innings['home'])
+    away_half_inning = solution.half_innings['away'][:, :, :max_runs + 1]
+    home_half_inning = solution.half_innings['home'][:, :, :max_runs + 1]
+
+    zero = MAX_RUN_DIFFERENTIAL
+    distribution = np.zeros((NUM_BATTERS, NUM_BATTERS, 2 * MAX_RUN_DIFFERENTIAL + 1))
+    distribution[0, 0, zero] = 1.0
+    for inning in range(1, REGULATION_INNINGS + 1):
+        distribution = _play_half(distribution, away_half_inning, 0, -1)
+        distribution = _play_half(distribution, home_half_inning, 1, 1)
+
+    # Game.is_game_over only ends a game at the end of a half, so a home
+    # lead after the top of the ninth and after the bottom are the same.
+    solution.home_win_pct = distribution[:, :, zero + 1:].sum()
+    solution.away_win_pct = distribution[:, :, :zero].sum()
+    tied = distribution[:, :, zero]
+    solution.extra_inning_pct = tied.sum()
+
+    home_wins, away_wins = _solve_extra_innings(tied, away_half_inning, home_half_inning)
+    solution.home_win_pct += home_wins
+    solution.away_win_pct += away_wins
+    solution.unresolved_pct = max(0.0, 1.0 - solution.home_win_pct - solution.away_win_pct)
+    solution.elapsed = time.perf_counter() - start
+    return solution
+
+
+def compare_with_simulation(home_team, away_team, num_games, seed=None):
+    home_profile = profiles.get_team_profile(home_team)
+    away_profile = profiles.get_team_profile(away_team)
+    solution = solve_game(home_profile, away_profile)
+    simulated = batch.simulate_games(home_profile, away_profile, num_games, seed=seed)
+    std_error = (solution.home_win_pct * (1 - solution.home_win_pct) / num_games) ** 0.5
+    return solution, simulated, std_error
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('home', action='store')
+    parser.add_argument('home_year', action='store')
+    parser.add_argument('away', action='store')
+    parser.add_argument('away_year', action='store')
+    parser.add_argument(
+        '--verify',
+        action='store',
+        type=int,
+        default=0,
+        help='Also simulate this many games and compare home win %%',
+    )
+    args = parser.parse_args()
+
+    home_team = models.Teams.filter(yearId=args.home_year, teamId=args.home)[0]
+    away_team = models.Teams.filter(yearId=args.away_year, teamId=args.away)[0]
+
+    if args.verify:
+        solution, simulated, std_error = compare_with_simulation(home_team, away_team, args.verify)
+        print(solution)
+        print()
+        print(simulated)
+        print()
+        print('Home win %: exact {:.4f}, simulated {:.4f} (+/- {:.4f} at 3 sigma)'.format(
+            solution.home_win_pct,
+            simulated.home_win_pct,
+            3 * std_error,
+        ))
+    else:
+        print(solve_game(home_team, away_team))
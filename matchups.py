@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+from itertools import accumulate
+
+import events
+
+
+# Every table is indexed by outcome code, events.OUTCOME_WALK through
+# events.OUTCOME_FLY_OUT.
+NUM_OUTCOMES = events.OUTCOME_FLY_OUT + 1
+
+MATCHUP_CACHE_SIZE = 4096
+
+
+def get_outcome_probabilities(batter, pitcher):
+    # Walk, strikeout and hit are each tested against the averaged rates and
+    # one of the successes is picked uniformly; no success is an out.
+    rates = [(p + b) / 2 for p, b in zip(pitcher.rates, batter.rates)]
+    probabilities = [0.0, 0.0, 0.0]
+    out = 0.0
+    for subset in range(8):
+        members = [idx for idx in range(3) if subset & (1 << idx)]
+        weight = 1.0
+        for idx in range(3):
+            weight *= rates[idx] if idx in members else 1.0 - rates[idx]
+        if not members:
+            out += weight
+        for idx in members:
+            probabilities[idx] += weight / len(members)
+    walk, strikeout, hit = probabilities
+    return walk, strikeout, hit, out
+
+
+def get_hit_type_probabilities(batter):
+    cumulative = batter.hit_types
+    probabilities = [cumulative[0]]
+    for idx in range(1, len(cumulative)):
+        probabilities.append(cumulative[idx] - cumulative[idx - 1])
+    # A draw past the end of the split has always counted as a single.
+    probabilities[0] += 1.0 - cumulative[-1]
+    return probabilities
+
+
+class Matchup(object):
+    # One batter against one pitcher: the chance of every outcome code and
+    # the running total of those chances, so a single uniform draw picks the
+    # outcome with bisect_right(cumulative, draw).
+
+    __slots__ = ('probabilities', 'cumulative', )
+
+    def __init__(self, probabilities):
+        self.probabilities = tuple(probabilities)
+        cumulative = list(accumulate(self.probabilities))
+        # Draws are below 1, so this keeps rounding from running off the end.
+        cumulative[-1] = 1.0
+        self.cumulative = tuple(cumulative)
+
+    @classmethod
+    def from_profiles(cls, batter, pitcher):
+        walk, strikeout, hit, out = get_outcome_probabilities(batter, pitcher)
+        hit_types = get_hit_type_probabilities(batter)
+        return cls(
+            [walk, strikeout]
+            + [hit * hit_type_pct for hit_type_pct in hit_types]
+            # Ground and fly outs are equally likely.
+            + [out / 2, out / 2]
+        )
+
+
+class MatchupCache(object):
+    # Least recently used matchups, shared by every game in the process.
+    # Keys are the rates themselves, so teams compiled again for a later
+    # batch still find their entries.
+
+    def __init__(self, size=MATCHUP_CACHE_SIZE):
+        self.size = size
+        self._matchups = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, batter, pitcher):
+        key = (batter.rates, batter.hit_types, pitcher.rates)
+        with self._lock:
+            matchup = self._matchups.get(key)
+            if matchup is not None:
+                self._matchups.move_to_end(key)
+                self.hits += 1
+                return matchup
+            self.misses += 1
+
+        matchup = Matchup.from_profiles(batter, pitcher)
+        with self._lock:
+            self._matchups[key] = matchup
+            self._evict()
+        return matchup
+
+    def resize(self, size):
+        with self._lock:
+            self.size = size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._matchups.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'entries': len(self._matchups),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _evict(self):
+        while len(self._matchups) > self.size:
+            self._matchups.popitem(last=False)
+            self.evictions += 1
+
+
+cache = MatchupCache()
+
+
+def get_matchup(batter, pitcher):
+    return cache.get(batter, pitcher)
@@ -1,8 +1,15 @@
+import copy
 from collections import defaultdict
 
+import profiling
 from tables import Table, QueryRow
 
 
+STATS_CACHE_SIZE = 4096
+
+# Stay well under SQLite's limit on bound parameters per statement.
+MAX_IN_VALUES = 500
+
 POSITIONS = [
     'P',
     'C',
@@ -18,26 +25,25 @@ POSITIONS = [
 
 class Player(QueryRow):
 
-    def __init__(self, data):
-        super(Player, self).__init__(data)
-
     def _get_stats(self, table):
-        stats = table.filter(playerID=self.playerID, team_ID=self.teamID)
-        for stat in stats:
-            stat.player = self
-        return stats
+        roster_stats = self.__dict__.get('_roster_stats')
+        if roster_stats is not None:
+            return list(roster_stats[table.table_name])
+        # Stats rows are shared through the table cache, so they carry no
+        # link back to any one player.
+        return table.filter(playerID=self.playerID, team_ID=self.teamID)
 
     def get_batting_stats(self):
         return self._get_stats(BattingStats)
 
     def get_fielding_stats(self):
-        return self._get_stats(Table('fielding'))
+        return self._get_stats(FieldingStats)
 
     def get_pitching_stats(self):
-        return self._get_stats(Table('pitching'))
+        return self._get_stats(PitchingStats)
 
     def get_plate_appearances(self):
-        return self._get_stats(Table('appearances'))
+        return self._get_stats(PlateAppearances)
 
     @property
     def name(self):
@@ -58,10 +64,19 @@ class Player(QueryRow):
 
 
 Players = Table('people', Player)
+FieldingStats = Table('fielding', QueryRow)
+PitchingStats = Table('pitching', QueryRow)
+PlateAppearances = Table('appearances', QueryRow)
+
+FieldingStats.enable_cache(STATS_CACHE_SIZE)
+PitchingStats.enable_cache(STATS_CACHE_SIZE)
+PlateAppearances.enable_cache(STATS_CACHE_SIZE)
 
 
 class BattingStats(QueryRow):
 
+    __slots__ = ()
+
     @property
     def avg(self):
         return float(self.hits) / self.at_bats
@@ -113,19 +128,21 @@ class BattingStats(QueryRow):
 
 
 BattingStats = Table('batting', BattingStats)
+BattingStats.enable_cache(STATS_CACHE_SIZE)
 
 
 class Team(QueryRow):
 
     def _get_player_ids(self):
         if not hasattr(self, '_player_ids'):
-            through_result = BattingStats.filter(team_ID=self.id)
+            through_result = BattingStats.query().filter(team_ID=self.id).only('playerID')
             self._player_ids = set(x.playerID for x in through_result)
         return self._player_ids
 
     def get_players(self):
-        player_ids = self._get_player_ids()
-        return self._get_players(player_ids)
+        if not hasattr(self, '_roster'):
+            load_rosters([self])
+        return list(self._roster)
 
     def get_player(self, **kwargs):
         player_ids = self._get_player_ids()
@@ -189,6 +206,64 @@ class Team(QueryRow):
 
 Teams = Table('teams', Team)
 
+ROSTER_STATS = [
+    BattingStats,
+    PitchingStats,
+    FieldingStats,
+    PlateAppearances,
+]
+
+
+def _filter_in(table, column, values, **kwargs):
+    values = list(values)
+    result = []
+    for idx in range(0, len(values), MAX_IN_VALUES):
+        lookup = {'{}__in'.format(column): values[idx:idx + MAX_IN_VALUES]}
+        lookup.update(kwargs)
+        result.extend(table.filter(**lookup))
+    return result
+
+
+def load_rosters(teams):
+    profiler = profiling.active
+    if profiler is not None:
+        with profiler.timed('roster.load'):
+            return _load_rosters(teams)
+    return _load_rosters(teams)
+
+
+def _load_rosters(teams):
+    # Fetches people and every stats table for all the teams in one query per
+    # table, then hydrates each team's players with their stats attached.
+    teams_by_id = {team.id: team for team in teams}
+    stats_by_player = {}
+    for table in ROSTER_STATS:
+        for stat in _filter_in(table, 'team_ID', teams_by_id):
+            player_stats = stats_by_player.setdefault((stat.team_ID, stat.playerID), {
+                x.table_name: [] for x in ROSTER_STATS
+            })
+            player_stats[table.table_name].append(stat)
+
+    people = {}
+    player_ids = set(player_id for _, player_id in stats_by_player)
+    for person in _filter_in(Players, 'playerID', player_ids):
+        people[person.playerID] = person
+
+    rosters = {team_id: [] for team_id in teams_by_id}
+    for (team_id, player_id), player_stats in stats_by_player.items():
+        if not player_stats[BattingStats.table_name] or player_id not in people:
+            continue
+        # A player can appear on several teams, each needing its own teamID.
+        player = copy.copy(people[player_id])
+        player.teamID = team_id
+        player._roster_stats = player_stats
+        rosters[team_id].append(player)
+
+    for team_id, team in teams_by_id.items():
+        team._roster = rosters[team_id]
+        team._player_ids = set(player.playerID for player in rosters[team_id])
+    return rosters
+
 
 class Lineup(object):
 
@@ -0,0 +1,189 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import batch
+import models
+import profiles
+import profiling
+
+
+# Games are sent to workers in fixed-size chunks to amortize task overhead.
+CHUNK_SIZE = 250
+
+# Profiles shipped to each worker process once, by the pool initializer.
+_worker_matchups = None
+
+
+def _init_worker(matchups):
+    global _worker_matchups
+    _worker_matchups = matchups
+
+
+def _simulate_chunk(matchup_idx, first_game, num_games, seed, key):
+    home_profile, away_profile = _worker_matchups[matchup_idx]
+    return batch.simulate_games(
+        home_profile,
+        away_profile,
+        num_games,
+        seed=seed,
+        first_game=first_game,
+        key=key,
+    )
+
+
+def _split_games(num_games, chunk_size):
+    return [
+        (first_game, min(chunk_size, num_games - first_game))
+        for first_game in range(0, num_games, chunk_size)
+    ]
+
+
+def _compile_matchups(matchups):
+    return [
+        (profiles.get_team_profile(home_team), profiles.get_team_profile(away_team))
+        for home_team, away_team in matchups
+    ]
+
+
+def simulate_matchups(matchups, num_games, workers=None, seed=None, chunk_size=CHUNK_SIZE,
+                      keys=None, profiler=None):
+    # Every game has its own random stream, keyed by matchup and game number,
+    # so results match a serial batch.simulate_games run with the same seed
+    # and key whatever the worker count or chunk size.
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    if keys is None:
+        keys = [(matchup_idx, ) for matchup_idx in range(len(matchups))]
+
+    # Only the lineup build is profiled; games run in the worker processes.
+    if profiler is not None:
+        with profiler.activate(), profiler.timed('lineup.build'):
+            compiled = _compile_matchups(matchups)
+    else:
+        compiled = _compile_matchups(matchups)
+    results = [batch.BatchResult(home, away) for home, away in compiled]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(compiled, ),
+    ) as executor:
+        futures = []
+        for matchup_idx in range(len(compiled)):
+            for first_game, chunk_games in _split_games(num_games, chunk_size):
+                future = executor.submit(
+                    _simulate_chunk,
+                    matchup_idx,
+                    first_game,
+                    chunk_games,
+                    seed,
+                    keys[matchup_idx],
+                )
+                futures.append((matchup_idx, future))
+        for matchup_idx, future in futures:
+            results[matchup_idx].merge(future.result())
+    elapsed = time.perf_counter() - start
+
+    # Report wall-clock throughput rather than summed worker time.
+    for result in results:
+        result.elapsed = elapsed
+        result.seed = seed
+    return results
+
+
+def simulate_games(home_team, away_team, num_games, workers=None, seed=None, profiler=None):
+    return simulate_matchups(
+        [(home_team, away_team)],
+        num_games,
+        workers=workers,
+        seed=seed,
+        keys=[()],
+        profiler=profiler,
+    )[0]
+
+
+def benchmark(home_team, away_team, num_games, max_workers=None, seed=0):
+    max_workers = max_workers or os.cpu_count() or 1
+    home_profile = profiles.get_team_profile(home_team)
+    away_profile = profiles.get_team_profile(away_team)
+
+    worker_counts = []
+    workers = 1
+    while workers < max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(max_workers)
+
+    timings = []
+    for workers in worker_counts:
+        result = simulate_games(home_profile, away_profile, num_games, workers=workers, seed=seed)
+        timings.append((workers, result.games_per_second))
+    return timings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('home', action='store')
+    parser.add_argument('home_year', action='store')
+    parser.add_argument('away', action='store')
+    parser.add_argument('away_year', action='store')
+    parser.add_argument(
+        '--games',
+        action='store',
+        type=int,
+        default=10000,
+    )
+    parser.add_argument(
+        '--workers',
+        action='store',
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        '--seed',
+        action='store',
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+    )
+    args = parser.parse_args()
+
+    profiler = profiling.Profiler() if args.profile else None
+
+    home_team = models.Teams.filter(yearId=args.home_year, teamId=args.home)[0]
+    away_team = models.Teams.filter(yearId=args.away_year, teamId=args.away)[0]
+
+    if args.benchmark:
+        timings = benchmark(home_team, away_team, args.games, args.workers)
+        base_rate = timings[0][1]
+        print('{:>8}{:>12}{:>10}'.format('Workers', 'Games/sec', 'Speedup'))
+        for workers, games_per_second in timings:
+            print('{:>8}{:>12.1f}{:>9.2f}x'.format(
+                workers,
+                games_per_second,
+                games_per_second / base_rate,
+            ))
+    else:
+        print(simulate_games(
+            home_team,
+            away_team,
+            args.games,
+            args.workers,
+            args.seed,
+            profiler=profiler,
+        ))
+
+    if profiler is not None:
+        print('\n' + str(profiler))
@@ -0,0 +1,114 @@
+import models
+
+
+WALK = 0
+STRIKEOUT = 1
+HIT = 2
+
+
+def _rate(numerator, denominator):
+    if not denominator:
+        return 0.0
+    return float(numerator) / denominator
+
+
+class BatterProfile(object):
+
+    __slots__ = ('name', 'rates', 'hit_types', 'playerID', )
+
+    def __init__(self, name, rates, hit_types, playerID=None):
+        self.name = name
+        self.rates = rates
+        self.hit_types = hit_types
+        self.playerID = playerID
+
+    @classmethod
+    def from_player(cls, player):
+        batting_stats = player.get_batting_stats()[0]
+        rates = (
+            _rate(batting_stats.walks, batting_stats.at_bats),
+            _rate(batting_stats.strikeouts, batting_stats.at_bats),
+            _rate(batting_stats.hits, batting_stats.at_bats),
+        )
+
+        # Cumulative single/double/triple/home-run split, indexed by hit type.
+        hit_types = []
+        total_pct = 0.0
+        for count in [
+            batting_stats.singles,
+            batting_stats.doubles,
+            batting_stats.triples,
+            batting_stats.home_runs,
+        ]:
+            total_pct += _rate(count, batting_stats.hits)
+            hit_types.append(total_pct)
+        if not batting_stats.hits:
+            hit_types = [1.0, 1.0, 1.0, 1.0]
+
+        return cls(player.name, rates, tuple(hit_types), playerID=player.playerID)
+
+    def __str__(self):
+        return self.name
+
+
+class PitcherProfile(object):
+
+    __slots__ = ('name', 'rates', 'avg_batters_faced', 'playerID', )
+
+    def __init__(self, name, rates, avg_batters_faced, playerID=None):
+        self.name = name
+        self.rates = rates
+        self.avg_batters_faced = avg_batters_faced
+        self.playerID = playerID
+
+    @classmethod
+    def from_player(cls, player):
+        pitching_stats = player.get_pitching_stats()[0]
+        rates = (
+            _rate(pitching_stats.walks, pitching_stats.batters_faced),
+            _rate(pitching_stats.strikeouts, pitching_stats.batters_faced),
+            _rate(pitching_stats.hits, pitching_stats.batters_faced),
+        )
+        avg_batters_faced = _rate(pitching_stats.batters_faced, pitching_stats.games)
+        return cls(player.name, rates, avg_batters_faced, playerID=player.playerID)
+
+    def __str__(self):
+        return self.name
+
+
+class TeamProfile(object):
+
+    __slots__ = ('teamID', 'name', 'year', 'batting_order', 'pitcher', 'league', )
+
+    def __init__(self, teamID, name, year, batting_order, pitcher, league=None):
+        self.teamID = teamID
+        self.name = name
+        self.year = year
+        self.batting_order = batting_order
+        self.pitcher = pitcher
+        self.league = league
+
+    @classmethod
+    def from_lineup(cls, lineup):
+        team = lineup.team
+        return cls(
+            team.teamID,
+            team.name,
+            team.year,
+            [BatterProfile.from_player(x) for x in lineup.batting_order],
+            PitcherProfile.from_player(lineup.lineup['P']),
+            league=team.lgID,
+        )
+
+    @classmethod
+    def from_team(cls, team, designated_hitter=True):
+        return cls.from_lineup(models.Lineup(team, designated_hitter=designated_hitter))
+
+    def __str__(self):
+        return '{} ({})'.format(self.name, self.year)
+
+
+def get_team_profile(team, designated_hitter=True):
+    if isinstance(team, TeamProfile):
+        return team
+    return TeamProfile.from_team(team, designated_hitter=designated_hitter)
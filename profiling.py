@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+# Profiler the Table layer reports to, if any. Instrumented code checks this
+# once per call, so nothing is timed while profiling is off.
+active = None
+
+_active_lock = threading.Lock()
+
+
+class Profiler(object):
+    # Wall time and call counts per named phase. Phases may nest (a roster
+    # load runs DB queries), in which case the outer phase includes the time
+    # of the inner ones.
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, phase, seconds, calls=1):
+        with self._lock:
+            self.totals[phase] += seconds
+            self.calls[phase] += calls
+
+    @contextmanager
+    def timed(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def wrap(self, phase, func):
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+        return timed_func
+
+    @contextmanager
+    def activate(self):
+        global active
+        with _active_lock:
+            previous = active
+            active = self
+        try:
+            yield self
+        finally:
+            with _active_lock:
+                active = previous
+
+    def get_report(self):
+        with self._lock:
+            return {
+                phase: {
+                    'calls': self.calls[phase],
+                    'total': total,
+                    'mean': total / self.calls[phase] if self.calls[phase] else 0.0,
+                }
+                for phase, total in self.totals.items()
+            }
+
+    def __str__(self):
+        report = self.get_report()
+        lines = ['{:<28}{:>10}{:>12}{:>12}'.format('Phase', 'Calls', 'Total ms', 'Mean us')]
+        for phase, entry in sorted(report.items(), key=lambda x: x[1]['total'], reverse=True):
+            lines.append('{:<28}{:>10}{:>12.3f}{:>12.2f}'.format(
+                phase,
+                entry['calls'],
+                entry['total'] * 1e3,
+                entry['mean'] * 1e6,
+            ))
+        return '\n'.join(lines)
@@ -0,0 +1,299 @@
+import argparse
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import models
+import profiles
+import sim
+import statlines
+
+
+GAMES_PER_TEAM = 162
+CHUNK_SIZE = 100
+
+# League profiles shipped to each worker process once, by the pool initializer.
+_worker_teams = None
+
+
+class TeamRecord(object):
+
+    def __init__(self):
+        self.wins = 0
+        self.losses = 0
+        self.runs_scored = 0
+        self.runs_allowed = 0
+
+    @property
+    def games(self):
+        return self.wins + self.losses
+
+    @property
+    def pct(self):
+        if not self.games:
+            return 0.0
+        return float(self.wins) / self.games
+
+    @property
+    def run_differential(self):
+        return self.runs_scored - self.runs_allowed
+
+    def merge(self, other):
+        self.wins += other.wins
+        self.losses += other.losses
+        self.runs_scored += other.runs_scored
+        self.runs_allowed += other.runs_allowed
+
+
+class SeasonResult(object):
+
+    def __init__(self, year, teams):
+        self.year = year
+        self.teams = teams
+        self.games = 0
+        self.elapsed = 0.0
+        self.records = {team.teamID: TeamRecord() for team in teams}
+        # Per-team arrays of lineup slot and pitcher lines, as statlines.SHAPE
+        # without the team axis.
+        self.lines = {team.teamID: statlines.new_totals()[0] for team in teams}
+
+    def add_game(self, game):
+        teams = {'home': game.home_lineup, 'away': game.away_lineup}
+        opponents = {'home': 'away', 'away': 'home'}
+        home_won = game.stats['home']['runs'] > game.stats['away']['runs']
+        game_lines = game.lines.as_array()
+        self.games += 1
+        for team_type, team in teams.items():
+            stats = game.stats[team_type]
+            record = self.records[team.teamID]
+            if home_won == (team_type == 'home'):
+                record.wins += 1
+            else:
+                record.losses += 1
+            record.runs_scored += stats['runs']
+            record.runs_allowed += game.stats[opponents[team_type]]['runs']
+            self.lines[team.teamID] += game_lines[stats['team']]
+
+    def merge(self, other):
+        self.games += other.games
+        for team_id, record in other.records.items():
+            self.records[team_id].merge(record)
+        for team_id, lines in other.lines.items():
+            self.lines[team_id] += lines
+        return self
+
+    @property
+    def batting_lines(self):
+        # A player can bat in more than one lineup slot (a DH who also starts
+        # in the field), so slots are summed per player. Names are not unique,
+        # so players are keyed by playerID.
+        totals = {}
+        for team in self.teams:
+            lines = self.lines[team.teamID]
+            for slot, batter in enumerate(team.batting_order):
+                key = (team.teamID, batter.playerID)
+                if key in totals:
+                    totals[key] = totals[key] + lines[slot]
+                else:
+                    totals[key] = lines[slot]
+        return {key: dict(zip(statlines.FIELDS, line.tolist())) for key, line in totals.items()}
+
+    @property
+    def pitching_lines(self):
+        return {
+            (team.teamID, team.pitcher.playerID): dict(zip(
+                statlines.PITCHING_FIELDS,
+                self.lines[team.teamID][statlines.PITCHER_ROW].tolist(),
+            ))
+            for team in self.teams
+        }
+
+    def get_standings(self):
+        leagues = defaultdict(list)
+        for team in self.teams:
+            leagues[team.league].append((team, self.records[team.teamID]))
+        standings = {}
+        for league, records in leagues.items():
+            records.sort(key=lambda x: (x[1].pct, x[1].run_differential), reverse=True)
+            standings[league] = records
+        return standings
+
+    def __str__(self):
+        lines = ['{} season ({} games, {:.2f}s)'.format(self.year, self.games, self.elapsed)]
+        for league, records in sorted(self.get_standings().items(), key=lambda x: str(x[0])):
+            leader = records[0][1]
+            lines.append('')
+            lines.append('{:<6}{:>5}{:>5}{:>7}{:>6}{:>6}{:>6}{:>6}'.format(
+                league, 'W', 'L', 'Pct', 'GB', 'RS', 'RA', 'Diff',
+            ))
+            for team, record in records:
+                games_back = ((leader.wins - record.wins) + (record.losses - leader.losses)) / 2.0
+                lines.append('{:<6}{:>5}{:>5}{:>7.3f}{:>6}{:>6}{:>6}{:>+6}'.format(
+                    team.teamID,
+                    record.wins,
+                    record.losses,
+                    record.pct,
+                    '-' if not games_back else '{:.1f}'.format(games_back),
+                    record.runs_scored,
+                    record.runs_allowed,
+                    record.run_differential,
+                ))
+        return '\n'.join(lines)
+
+
+def load_season(year):
+    teams = models.Teams.filter(yearID=year)
+    models.load_rosters(teams)
+    return [profiles.get_team_profile(team) for team in teams]
+
+
+def _get_round_robin_rounds(num_teams):
+    # Circle method; None is a bye when the number of teams is odd.
+    slots = list(range(num_teams))
+    if num_teams % 2:
+        slots.append(None)
+    rounds = []
+    for _ in range(len(slots) - 1):
+        half = len(slots) // 2
+        rounds.append([(slots[idx], slots[-idx - 1]) for idx in range(half)])
+        slots = [slots[0], slots[-1]] + slots[1:-1]
+    return rounds
+
+
+def generate_schedule(num_teams, games_per_team=GAMES_PER_TEAM):
+    # Cycles through round-robin rounds, switching home and away on every
+    # pass, until each team has played games_per_team games.
+    rounds = _get_round_robin_rounds(num_teams)
+    games_played = [0] * num_teams
+    schedule = []
+    cycle = 0
+    while min(games_played) < games_per_team:
+        for matchups in rounds:
+            for first, second in matchups:
+                if first is None or second is None:
+                    continue
+                if max(games_played[first], games_played[second]) >= games_per_team:
+                    continue
+                if cycle % 2:
+                    first, second = second, first
+                schedule.append((first, second))
+                games_played[first] += 1
+                games_played[second] += 1
+        cycle += 1
+    return schedule
+
+
+def _simulate_schedule(teams, year, schedule, seed, season_idx=0, first_game=0):
+    # Game N of season S draws from the stream for (seed, (S, N)), so results
+    # do not depend on how the schedule is chunked or which process runs it.
+    listener = sim.NullListener()
+    result = SeasonResult(year, teams)
+    for game_idx, (home_idx, away_idx) in enumerate(schedule, first_game):
+        game = sim.Game(
+            teams[home_idx],
+            teams[away_idx],
+            0,
+            listener=listener,
+            seed=seed,
+            key=(season_idx, ),
+            game_idx=game_idx,
+        )
+        game.simulate()
+        result.add_game(game)
+    return result
+
+
+def _init_worker(teams):
+    global _worker_teams
+    _worker_teams = teams
+
+
+def _simulate_chunk(year, schedule, seed, season_idx, first_game):
+    return _simulate_schedule(_worker_teams, year, schedule, seed, season_idx, first_game)
+
+
+def _get_chunks(schedule):
+    return [
+        (idx, schedule[idx:idx + CHUNK_SIZE]) for idx in range(0, len(schedule), CHUNK_SIZE)
+    ]
+
+
+def simulate_seasons(year, num_seasons=1, workers=1, seed=None, schedule=None):
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    teams = load_season(year)
+    if schedule is None:
+        schedule = generate_schedule(len(teams))
+    chunks = _get_chunks(schedule)
+
+    executor = None
+    if workers != 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(teams, ),
+        )
+
+    results = []
+    try:
+        for season_idx in range(num_seasons):
+            start = time.perf_counter()
+            result = SeasonResult(year, teams)
+            if executor is None:
+                for first_game, chunk in chunks:
+                    result.merge(
+                        _simulate_schedule(teams, year, chunk, seed, season_idx, first_game)
+                    )
+            else:
+                futures = [
+                    executor.submit(_simulate_chunk, year, chunk, seed, season_idx, first_game)
+                    for first_game, chunk in chunks
+                ]
+                for future in futures:
+                    result.merge(future.result())
+            result.elapsed = time.perf_counter() - start
+            results.append(result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return results
+
+
+def simulate_season(year, workers=1, seed=None, schedule=None):
+    return simulate_seasons(year, 1, workers=workers, seed=seed, schedule=schedule)[0]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('year', action='store', type=int)
+    parser.add_argument(
+        '--seasons',
+        action='store',
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--workers',
+        action='store',
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--seed',
+        action='store',
+        type=int,
+        default=None,
+    )
+    args = parser.parse_args()
+
+    results = simulate_seasons(args.year, args.seasons, args.workers, args.seed)
+    print(results[-1])
+    elapsed = [result.elapsed for result in results]
+    print('\n{} season(s): {:.3f}s per season (min {:.3f}s, max {:.3f}s)'.format(
+        len(results),
+        sum(elapsed) / len(elapsed),
+        min(elapsed),
+        max(elapsed),
+    ))
@@ -1,15 +1,29 @@
 import argparse
-import random
+import bisect
+import contextlib
 import time
 
+import basestate
 import events
+import matchups
 import models
+import profiles
+import profiling
+import statlines
+import streams
 
 
-FIRST_BASE = 0
-SECOND_BASE = 1
-THIRD_BASE = 2
-HOME_RUN = 3
+FIRST_BASE = events.FIRST_BASE
+SECOND_BASE = events.SECOND_BASE
+THIRD_BASE = events.THIRD_BASE
+HOME_RUN = events.HOME_RUN
+
+OUT_VERBS = {
+    events.OUTCOME_GROUND_OUT: 'grounds-out',
+    events.OUTCOME_FLY_OUT: 'flies-out',
+}
+
+EMPTY_BASES = (None, None, None)
 
 FATIGUE_LEVEL_1 = 0
 FATIGUE_LEVEL_2 = 1
@@ -18,64 +32,127 @@ FATIGUE_LEVEL_3 = 2
 
 class ConsoleListener(object):
 
+    event_types = events.TEXT_EVENTS
+
+    def on_event(self, event):
+        text = event.render()
+        if text is not None:
+            print(text)
+
+
+class NullListener(object):
+
+    event_types = ()
+
     def on_event(self, event):
-        if isinstance(event, str):
-            print(event)
+        pass
 
 
 class Game(object):
 
-    def __init__(self, home_team, away_team, time_step, listener=None):
+    def __init__(self, home_team, away_team, time_step, listener=None, rng=None, seed=None,
+                 profiler=None, key=(), game_idx=0):
         self.home_team = home_team
         self.away_team = away_team
         self.time_step = time_step
+        # Game N of a seeded run draws from the stream for (seed, key + (N, )),
+        # the same one batch, parallel and season runs give it.
+        if rng is None:
+            rng = streams.RandomStream(seed, tuple(key) + (game_idx, ))
+        self.rng = rng
 
         if listener:
             self.listener = listener
         else:
             self.listener = ConsoleListener()
-
-        self.home_lineup = models.Lineup(home_team, designated_hitter=True)
-        self.away_lineup = models.Lineup(away_team, designated_hitter=True)
+        self.subscriptions = events.get_subscriptions(self.listener)
+
+        # Instrumented methods are swapped in per instance, so an unprofiled
+        # game runs exactly the same code as before.
+        self.profiler = profiler
+        # Precompiled profiles pass straight through build_lineups, so only a
+        # real compile is timed.
+        compiled = all(isinstance(x, profiles.TeamProfile) for x in [home_team, away_team])
+        if profiler is not None and not compiled:
+            with profiler.activate(), profiler.timed('lineup.build'):
+                self.build_lineups()
+        else:
+            self.build_lineups()
+        if profiler is not None:
+            for phase, name in [
+                ('game.plate_appearance', 'simulate_plate_appearance'),
+                ('events.dispatch', 'publish_event'),
+                ('sleep', 'sleep'),
+            ]:
+                setattr(self, name, profiler.wrap(phase, getattr(self, name)))
 
         self.outs = 0
         self.strikes = 0
         self.balls = 0
 
-        self.home_pitcher = self.home_lineup.lineup['P']
-        self.away_pitcher = self.away_lineup.lineup['P']
+        self.home_pitcher = self.home_lineup.pitcher
+        self.away_pitcher = self.away_lineup.pitcher
+
+        # Cumulative outcome table of every batter/pitcher pair this game
+        # has seen, taken from the shared matchup cache on first use.
+        self.matchups = {}
 
         self.stats = {
             'home': {
+                'team': statlines.HOME,
                 'runs': 0,
                 'batting_idx': 0,
-                'hits': 0,
-                'walks': 0,
                 'errors': 0,
                 'box_score': [],
-                'batters_faced': 0,
             },
             'away': {
+                'team': statlines.AWAY,
                 'runs': 0,
                 'batting_idx': 0,
-                'hits': 0,
-                'walks': 0,
                 'errors': 0,
                 'box_score': [{'runs': 0, 'hits': 0, 'errors': 0, }, ],
-                'batters_faced': 0,
             },
         }
         self.stats['top'] = self.stats['away']
         self.stats['bottom'] = self.stats['home']
 
+        # Lineup slot of every batter, to credit runs to whoever scores.
+        self.batting_slots = {}
+        for lineup in [self.home_lineup, self.away_lineup]:
+            for idx, batter in enumerate(lineup.batting_order):
+                self.batting_slots[batter] = idx
+
+        # Per-player counting stats; the outcome methods bump entries at the
+        # current batter's and pitcher's offsets.
+        self.lines = statlines.StatLines()
+        self.batter_offset = 0
+        self.pitcher_offset = 0
+
         self.inning = 1
         self.inning_half = 'top'
 
-        self.bases = [None, None, None]
+        self.clear_bases()
+
+    def build_lineups(self):
+        # Rates for every batter and both pitchers are compiled once here so
+        # that plate appearances never touch the database.
+        self.home_lineup = profiles.get_team_profile(self.home_team, designated_hitter=True)
+        self.away_lineup = profiles.get_team_profile(self.away_team, designated_hitter=True)
 
     def publish_event(self, event):
         self.listener.on_event(event)
 
+    def publish_score(self):
+        if self.subscriptions[events.ScoreEvent]:
+            self.publish_event(
+                events.ScoreEvent(
+                    self.away_team.teamID,
+                    self.stats['away']['runs'],
+                    self.home_team.teamID,
+                    self.stats['home']['runs'],
+                )
+            )
+
     def start_game(self):
         self.outs = 0
         self.strikes = 0
@@ -87,7 +164,7 @@ class Game(object):
         self.inning = 1
         self.inning_half = 'top'
 
-        self.bases = [None, None, None]
+        self.clear_bases()
 
     def advance_inning_half(self):
         self.outs = 0
@@ -104,147 +181,147 @@ class Game(object):
             {'runs': 0, 'hits': 0, 'errors': 0, }
         )
 
-        self.bases = [None, None, None]
-
-    def _is_forced_to_advance(self, base):
-        return all(self.bases[:base + 1])
-
-    def advance_runners(self, amount, is_walk=False):
-        while amount > 0:
-            for base in [THIRD_BASE, SECOND_BASE, FIRST_BASE]:
-                if not self.bases[base]:
-                    continue
-                if not is_walk or self._is_forced_to_advance(base):
-                    player = self.bases[base]
-                    self.bases[base] = None
-                    if base == THIRD_BASE:
-                        self.score_run(player)
-                    else:
-                        self.bases[base + 1] = player
-            amount -= 1
+        self.clear_bases()
 
-    def walk(self, batter, pitcher):
-        self.advance_runners(1, is_walk=True)
-        self.bases[FIRST_BASE] = batter
-        self.stats[self.inning_half]['walks'] += 1
-        self.publish_event('{} walks {}'.format(pitcher.name, batter.name))
+    def clear_bases(self):
+        self.base_mask = 0
+        self.runners = EMPTY_BASES
 
-    def strikeout(self, batter, pitcher):
-        self.outs += 1
-        self.publish_event('{} strikes-out {}'.format(pitcher.name, batter.name))
-
-    def hit(self, batter, pitcher):
-        batting_stats = batter.get_batting_stats()[0]
-        probabilities = [
-            (float(batting_stats.singles) / batting_stats.hits, FIRST_BASE),
-            (float(batting_stats.doubles) / batting_stats.hits, SECOND_BASE),
-            (float(batting_stats.triples) / batting_stats.hits, THIRD_BASE),
-            (float(batting_stats.home_runs) / batting_stats.hits, HOME_RUN),
-        ]
-        rng = random.random()
-        total_pct = 0
-        hit_type = None
-        for pct, outcome in probabilities:
-            total_pct += pct
-            if rng < total_pct:
-                hit_type = outcome
-                break
+    @property
+    def bases(self):
+        return list(self.runners)
 
-        if not hit_type:
-            hit_type = FIRST_BASE
+    @bases.setter
+    def bases(self, bases):
+        self.runners = tuple(bases)
+        self.base_mask = sum(1 << base for base, runner in enumerate(bases) if runner is not None)
 
-        self.advance_runners(hit_type + 1)
+    def get_state(self):
+        # Everything needed to resume the half inning; all immutable, so a
+        # copy is just this tuple.
+        return (self.outs, self.base_mask, self.runners)
 
-        if hit_type == HOME_RUN:
-            self.score_run(batter)
-        else:
-            self.bases[hit_type] = batter
+    def set_state(self, state):
+        self.outs, self.base_mask, self.runners = state
+
+    def apply_transition(self, transition, batter):
+        occupants = self.runners + (batter, None)
+        if transition.runs:
+            self.scorers = tuple(occupants[base] for base in transition.scorers)
+            for runner in self.scorers:
+                self.score_run(runner)
+        self.runners = transition.runners(occupants)
+        self.base_mask = transition.next_bases
+
+    def walk(self, batter, pitcher):
+        self.apply_transition(basestate.WALK_TRANSITIONS[self.base_mask], batter)
+        values = self.lines.values
+        values[self.batter_offset + statlines.WALKS] += 1
+        values[self.pitcher_offset + statlines.WALKS] += 1
+        self.outcome = events.OUTCOME_WALK
+        if self.subscriptions[events.WalkEvent]:
+            self.publish_event(events.WalkEvent(batter, pitcher))
+
+    def strikeout(self, batter, pitcher):
+        self.outs += 1
+        values = self.lines.values
+        values[self.batter_offset + statlines.STRIKEOUTS] += 1
+        values[self.batter_offset + statlines.OUTS] += 1
+        values[self.pitcher_offset + statlines.STRIKEOUTS] += 1
+        values[self.pitcher_offset + statlines.OUTS] += 1
+        self.outcome = events.OUTCOME_STRIKEOUT
+        if self.subscriptions[events.StrikeoutEvent]:
+            self.publish_event(events.StrikeoutEvent(batter, pitcher))
+
+    def hit(self, batter, pitcher, hit_type):
+        self.apply_transition(basestate.HIT_TRANSITIONS[hit_type][self.base_mask], batter)
 
-        self.stats[self.inning_half]['hits'] += 1
         self.stats[self.inning_half]['box_score'][self.inning - 1]['hits'] += 1
+        values = self.lines.values
+        values[self.batter_offset + statlines.HITS] += 1
+        values[self.batter_offset + statlines.SINGLES + hit_type] += 1
+        values[self.pitcher_offset + statlines.HITS] += 1
+        values[self.pitcher_offset + statlines.SINGLES + hit_type] += 1
+        self.outcome = events.OUTCOME_SINGLE + hit_type
 
-        hit_verbs = {
-            FIRST_BASE: 'singles',
-            SECOND_BASE: 'doubles',
-            THIRD_BASE: 'triples',
-            HOME_RUN: 'hits a home-run'
-        }
-        self.publish_event('{} {} off {}'.format(batter.name, hit_verbs[hit_type], pitcher.name))
+        if self.subscriptions[events.HitEvent]:
+            self.publish_event(events.HitEvent(batter, pitcher, hit_type))
 
-    def out(self, batter, pitcher):
+    def out(self, batter, pitcher, outcome):
         self.outs += 1
-        hit_type = random.choice(['grounds-out', 'flies-out', ])
-        self.publish_event('{} {}'.format(batter.name, hit_type))
-        self.publish_event(events.OutEvent(self.outs))
+        values = self.lines.values
+        values[self.batter_offset + statlines.OUTS] += 1
+        values[self.pitcher_offset + statlines.OUTS] += 1
+        self.outcome = outcome
+        if self.subscriptions[events.BattedOutEvent]:
+            self.publish_event(events.BattedOutEvent(batter, OUT_VERBS[outcome]))
+        if self.subscriptions[events.OutEvent]:
+            self.publish_event(events.OutEvent(self.outs))
 
     def score_run(self, player):
-        self.stats[self.inning_half]['runs'] += 1
+        offensive_stats = self.stats[self.inning_half]
+        offensive_stats['runs'] += 1
+        values = self.lines.values
+        runner_offset = statlines.get_batter_offset(
+            offensive_stats['team'],
+            self.batting_slots[player],
+        )
+        values[runner_offset + statlines.RUNS] += 1
+        values[self.pitcher_offset + statlines.RUNS] += 1
         self.stats[self.inning_half]['box_score'][self.inning - 1]['runs'] += 1
         self.runs_per_outcome += 1
 
-    def get_pitcher_probabilities(self, pitcher):
-        pitching_stats = pitcher.get_pitching_stats()[0]
-        pitcher_probabilities = {}
-        pitcher_probabilities['walk_pct'] = float(pitching_stats.walks) / pitching_stats.batters_faced
-        pitcher_probabilities['strikeout_pct'] = float(pitching_stats.strikeouts) / pitching_stats.batters_faced
-        pitcher_probabilities['hit_pct'] = float(pitching_stats.hits) / pitching_stats.batters_faced
-        return pitcher_probabilities
-
-    def get_batter_probabilities(self, batter):
-        batting_stats = batter.get_batting_stats()[0]
-        batter_probabilities = {}
-        batter_probabilities['walk_pct'] = float(batting_stats.walks) / batting_stats.at_bats
-        batter_probabilities['strikeout_pct'] = float(batting_stats.strikeouts) / batting_stats.at_bats
-        batter_probabilities['hit_pct'] = float(batting_stats.hits) / batting_stats.at_bats
-        return batter_probabilities
-
-    def average_and_calculate_outcome(self, pitcher_stats, batter_stats, stat):
-        rng = random.random()
-        avg_prob = (pitcher_stats[stat] + batter_stats[stat]) / 2
-        if rng < avg_prob:
-            return True
-        return False
+    def get_matchup(self, batter, pitcher):
+        cumulative = self.matchups.get((batter, pitcher))
+        if cumulative is None:
+            cumulative = matchups.get_matchup(batter, pitcher).cumulative
+            self.matchups[(batter, pitcher)] = cumulative
+        return cumulative
 
     def simulate_plate_appearance(self, batter, pitcher):
-        pitcher_probability = self.get_pitcher_probabilities(pitcher)
-        batter_probability = self.get_batter_probabilities(batter)
-
-        simulations = [
-            ('walk_pct', self.walk),
-            ('strikeout_pct', self.strikeout),
-            ('hit_pct', self.hit),
-        ]
-        possible_outcomes = []
-        for stat, sim_callback in simulations:
-            if self.average_and_calculate_outcome(pitcher_probability, batter_probability, stat):
-                possible_outcomes.append(sim_callback)
-
-        if possible_outcomes:
-            outcome = random.choice(possible_outcomes)
-        else:
-            outcome = self.out
+        outcome = bisect.bisect_right(self.get_matchup(batter, pitcher), self.rng.random())
+
+        logging = self.subscriptions[events.PlateAppearanceEvent]
+        if logging:
+            bases_before = self.base_mask
 
         self.runs_per_outcome = 0
-        outcome(batter, pitcher)
-        if self.runs_per_outcome:
-            if self.runs_per_outcome == 1:
-                self.publish_event('1 run scores')
-            else:
-                self.publish_event('{} runs score'.format(self.runs_per_outcome))
-            self.publish_event('{} {} - {} {}'.format(
-                self.away_team.teamID,
-                self.stats['away']['runs'],
-                self.home_team.teamID,
-                self.stats['home']['runs'],
-            ))
+        self.scorers = ()
+        if outcome >= events.OUTCOME_GROUND_OUT:
+            self.out(batter, pitcher, outcome)
+        elif outcome >= events.OUTCOME_SINGLE:
+            self.hit(batter, pitcher, outcome - events.OUTCOME_SINGLE)
+        elif outcome == events.OUTCOME_STRIKEOUT:
+            self.strikeout(batter, pitcher)
+        else:
+            self.walk(batter, pitcher)
+
+        if logging:
             self.publish_event(
-                events.ScoreEvent(
-                    self.away_team.teamID,
-                    self.stats['away']['runs'],
-                    self.home_team.teamID,
-                    self.stats['home']['runs'],
+                events.PlateAppearanceEvent(
+                    self.inning,
+                    0 if self.inning_half == 'top' else 1,
+                    self.stats[self.inning_half]['batting_idx'],
+                    self.outcome,
+                    bases_before,
+                    self.base_mask,
+                    self.outs,
+                    self.runs_per_outcome,
                 )
             )
+        if self.runs_per_outcome:
+            if self.subscriptions[events.RunsScoredEvent]:
+                self.publish_event(
+                    events.RunsScoredEvent(
+                        self.runs_per_outcome,
+                        self.away_team.teamID,
+                        self.stats['away']['runs'],
+                        self.home_team.teamID,
+                        self.stats['home']['runs'],
+                        scorers=self.scorers,
+                    )
+                )
+            self.publish_score()
 
         batting_idx = self.stats[self.inning_half]['batting_idx']
         self.stats[self.inning_half]['batting_idx'] = (batting_idx + 1) % 9
@@ -267,41 +344,52 @@ class Game(object):
     def get_defensive_stats(self):
         return self.stats['home'] if self.inning_half == 'top' else self.stats['away']
 
+    def get_batting_line(self):
+        offensive_stats = self.get_offensive_stats()
+        return self.lines.get_batting_line(offensive_stats['team'], offensive_stats['batting_idx'])
+
+    def get_pitching_line(self, team_type):
+        return self.lines.get_pitching_line(self.stats[team_type]['team'])
+
+    def get_team_total(self, team_type, stat):
+        return self.lines.get_team_total(self.stats[team_type]['team'], stat)
+
     def get_current_batter(self):
         offensive_stats = self.get_offensive_stats()
         batting_idx = offensive_stats['batting_idx']
         batting_lineup = self.get_batting_lineup()
         return batting_lineup.batting_order[batting_idx]
 
-    def simulate_inning_half(self):
-        self.publish_event('\n-- {} of Inning {} --\n'.format(self.inning_half.title(), self.inning))
-        self.publish_event(events.InningEvent(self.inning_half, self.inning))
-        self.publish_event(events.OutEvent(self.outs))
-        self.publish_event(
-            events.ScoreEvent(
-                self.away_team.teamID,
-                self.stats['away']['runs'],
-                self.home_team.teamID,
-                self.stats['home']['runs'],
-            )
-        )
+    def play_inning_half(self):
+        if self.subscriptions[events.InningEvent]:
+            self.publish_event(events.InningEvent(self.inning_half, self.inning))
+        if self.subscriptions[events.OutEvent]:
+            self.publish_event(events.OutEvent(self.outs))
+        self.publish_score()
 
         pitcher = self.get_current_pitcher()
-        defensive_stats = self.get_defensive_stats()
+        offensive_stats = self.get_offensive_stats()
+        team = offensive_stats['team']
+        values = self.lines.values
+        self.pitcher_offset = statlines.get_pitcher_offset(1 - team)
 
         while self.outs < 3:
             batter = self.get_current_batter()
+            self.batter_offset = statlines.get_batter_offset(team, offensive_stats['batting_idx'])
+            values[self.batter_offset + statlines.PLATE_APPEARANCES] += 1
+            values[self.pitcher_offset + statlines.PLATE_APPEARANCES] += 1
             self.simulate_plate_appearance(
                 batter,
                 pitcher,
             )
-            defensive_stats['batters_faced'] += 1
-            time.sleep(self.time_step)
+            yield
 
-    def simulate(self):
+    def play(self):
+        # Yields after every plate appearance, so the caller decides how the
+        # game is paced.
         self.start_game()
         while True:
-            self.simulate_inning_half()
+            yield from self.play_inning_half()
             if self.is_game_over():
                 break
             else:
@@ -309,6 +397,24 @@ class Game(object):
 
         self.print_box_score()
 
+    def sleep(self):
+        time.sleep(self.time_step)
+
+    def simulate_inning_half(self):
+        for _ in self.play_inning_half():
+            if self.time_step:
+                self.sleep()
+
+    def simulate(self):
+        for _ in self.play():
+            if self.time_step:
+                self.sleep()
+
+    def get_profile(self):
+        if self.profiler is None:
+            raise RuntimeError('Game was not created with a profiler')
+        return self.profiler.get_report()
+
     def is_game_over(self):
         if self.inning < 9:
             return False
@@ -325,42 +431,39 @@ class Game(object):
 
         return False
 
-    def _print_team_line(self, team_id, team_type):
-        per_inning_runs = ''.join(['{:>5}'.format(x['runs']) for x in self.stats[team_type]['box_score']])
-        total_runs = self.stats[team_type]['runs']
-        total_hits = self.stats[team_type]['hits']
-        total_errors = self.stats[team_type]['errors']
-        team_line = '{} {}{:>5}{:>5}{:>5}'.format(
-            team_id,
-            per_inning_runs,
-            total_runs,
-            total_hits,
-            total_errors,
-        )
-        self.publish_event(team_line)
-
     def print_box_score(self):
-        home_score = self.stats['home']['runs']
-        away_score = self.stats['away']['runs']
-        winning_team = self.home_team.name if home_score > away_score else self.away_team.name
-        self.publish_event('\n{} win!\n'.format(winning_team))
-
-        num_innings = len(self.stats['away']['box_score']) + 1
-        box_score_header = 'Team    1    2    3    4    5    6    7    8    9'
-        if num_innings > 9:
-            for i in range(10, num_innings):
-                box_score_header += '{:>5}'.format(i)
-        box_score_header += '    R    H    E'
-        self.publish_event(box_score_header)
-        self._print_team_line(self.away_team.teamID, 'away')
-        self._print_team_line(self.home_team.teamID, 'home')
+        if self.subscriptions[events.GameOverEvent]:
+            home_score = self.stats['home']['runs']
+            away_score = self.stats['away']['runs']
+            winning_team = self.home_team.name if home_score > away_score else self.away_team.name
+            self.publish_event(events.GameOverEvent(winning_team))
+
+        if self.subscriptions[events.BoxScoreEvent]:
+            self.publish_event(
+                events.BoxScoreEvent(
+                    self.away_team.teamID,
+                    self.get_box_score_line('away'),
+                    self.home_team.teamID,
+                    self.get_box_score_line('home'),
+                    lines=self.lines,
+                )
+            )
+
+    def get_box_score_line(self, team_type):
+        stats = self.stats[team_type]
+        return {
+            'box_score': stats['box_score'],
+            'runs': stats['runs'],
+            'hits': self.get_team_total(team_type, statlines.HITS),
+            'errors': stats['errors'],
+        }
 
     def get_fatigue_level(self, pitcher):
-        stats = pitcher.get_pitching_stats()[0]
-        avg_batters_faced = float(stats.batters_faced) / stats.games
+        avg_batters_faced = pitcher.avg_batters_faced
 
-        team_type = 'home' if pitcher is self.home_pitcher else 'away'
-        batters_faced = self.stats[team_type]['batters_faced']
+        team = statlines.HOME if pitcher is self.home_pitcher else statlines.AWAY
+        offset = statlines.get_pitcher_offset(team) + statlines.PLATE_APPEARANCES
+        batters_faced = self.lines.values[offset]
 
         if batters_faced < avg_batters_faced - 3:
             return FATIGUE_LEVEL_1
@@ -394,17 +497,86 @@ if __name__ == '__main__':
         type=float,
         default=0.5
     )
+    parser.add_argument(
+        '--games',
+        action='store',
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        '--log',
+        action='store',
+        default=None,
+    )
+    parser.add_argument(
+        '--seed',
+        action='store',
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+    )
     args = parser.parse_args()
 
-    home_team = models.Teams.filter(
-        yearId=args.home_year,
-        teamId=args.home,
-    )[0]
-
-    away_team = models.Teams.filter(
-        yearId=args.away_year,
-        teamId=args.away,
-    )[0]
+    profiler = None
+    activation = contextlib.nullcontext()
+    if args.profile:
+        profiler = profiling.Profiler()
+        activation = profiler.activate()
+
+    with activation:
+        home_team = models.Teams.filter(
+            yearId=args.home_year,
+            teamId=args.home,
+        )[0]
+
+        away_team = models.Teams.filter(
+            yearId=args.away_year,
+            teamId=args.away,
+        )[0]
+
+        if args.games:
+            import batch
+            if args.log:
+                import gamelog
+                with gamelog.GameLogWriter(args.log) as log_writer:
+                    print(batch.simulate_games(
+                        home_team,
+                        away_team,
+                        args.games,
+                        listener=log_writer,
+                        seed=args.seed,
+                        profiler=profiler,
+                    ))
+            else:
+                print(batch.simulate_games(
+                    home_team,
+                    away_team,
+                    args.games,
+                    seed=args.seed,
+                    profiler=profiler,
+                ))
+        elif args.log:
+            import gamelog
+            with gamelog.GameLogWriter(args.log) as log_writer:
+                bus = events.EventBus()
+                bus.subscribe(ConsoleListener())
+                bus.subscribe(log_writer)
+                game = Game(
+                    home_team,
+                    away_team,
+                    args.time_step,
+                    listener=bus,
+                    seed=args.seed,
+                    profiler=profiler,
+                )
+                game.simulate()
+                bus.close()
+        else:
+            game = Game(home_team, away_team, args.time_step, seed=args.seed, profiler=profiler)
+            game.simulate()
 
-    game = Game(home_team, away_team, args.time_step)
-    game.simulate()
+    if profiler is not None:
+        print('\n' + str(profiler))
@@ -0,0 +1,106 @@
+from array import array
+
+import numpy as np
+
+
+AWAY = 0
+HOME = 1
+
+TEAM_INDEXES = {'away': AWAY, 'home': HOME, 'top': AWAY, 'bottom': HOME}
+
+NUM_BATTERS = 9
+
+# Each team has a row per lineup slot followed by a row for its pitcher.
+PITCHER_ROW = NUM_BATTERS
+ROWS_PER_TEAM = NUM_BATTERS + 1
+
+# Columns of every row. For the pitcher row plate appearances are batters
+# faced, hits/walks/strikeouts/runs are allowed and outs are outs recorded.
+PLATE_APPEARANCES = 0
+HITS = 1
+SINGLES = 2
+DOUBLES = 3
+TRIPLES = 4
+HOME_RUNS = 5
+WALKS = 6
+STRIKEOUTS = 7
+RUNS = 8
+OUTS = 9
+
+FIELDS = [
+    'plate_appearances',
+    'hits',
+    'singles',
+    'doubles',
+    'triples',
+    'home_runs',
+    'walks',
+    'strikeouts',
+    'runs',
+    'outs',
+]
+
+PITCHING_FIELDS = ['batters_faced'] + FIELDS[1:]
+
+NUM_STATS = len(FIELDS)
+
+SHAPE = (2, ROWS_PER_TEAM, NUM_STATS)
+
+_EMPTY = array('q', bytes(8 * 2 * ROWS_PER_TEAM * NUM_STATS))
+
+
+def get_offset(team, row):
+    return (team * ROWS_PER_TEAM + row) * NUM_STATS
+
+
+def get_batter_offset(team, slot):
+    return get_offset(team, slot)
+
+
+def get_pitcher_offset(team):
+    return get_offset(team, PITCHER_ROW)
+
+
+def new_totals():
+    return np.zeros(SHAPE, dtype=np.int64)
+
+
+class StatLines(object):
+    # One game's counting stats in a flat int64 array, laid out as SHAPE.
+    # Game bumps entries by offset; totals across games are summed through
+    # a zero-copy numpy view of the same buffer.
+
+    __slots__ = ('values', )
+
+    def __init__(self):
+        self.values = array('q', _EMPTY)
+
+    def reset(self):
+        self.values[:] = _EMPTY
+
+    def as_array(self):
+        return np.frombuffer(self.values, dtype=np.int64).reshape(SHAPE)
+
+    def add_to(self, totals):
+        totals += self.as_array()
+        return totals
+
+    def get_team_total(self, team, stat):
+        offset = get_offset(team, 0)
+        return sum(self.values[offset + stat:offset + NUM_BATTERS * NUM_STATS:NUM_STATS])
+
+    def get_batting_line(self, team, slot):
+        offset = get_batter_offset(team, slot)
+        return dict(zip(FIELDS, self.values[offset:offset + NUM_STATS]))
+
+    def get_pitching_line(self, team):
+        offset = get_pitcher_offset(team)
+        return dict(zip(PITCHING_FIELDS, self.values[offset:offset + NUM_STATS]))
+
+
+def get_batting_line(totals, team, slot):
+    return dict(zip(FIELDS, totals[team, slot].tolist()))
+
+
+def get_pitching_line(totals, team):
+    return dict(zip(PITCHING_FIELDS, totals[team, PITCHER_ROW].tolist()))
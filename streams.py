@@ -0,0 +1,26 @@
+import itertools
+
+import numpy as np
+
+
+# Uniforms drawn per refill; a nine-inning game uses a few hundred.
+BLOCK_SIZE = 512
+
+
+class RandomStream(object):
+    # The uniform random() draws Game makes, taken from numpy in blocks. A
+    # stream is fully determined by its seed and key, so game N of a seeded
+    # run sees the same numbers whether it is played serially, in a batch or
+    # on any worker of a pool.
+
+    __slots__ = ('seed', 'key', 'random', )
+
+    def __init__(self, seed=None, key=(), block_size=BLOCK_SIZE):
+        self.seed = seed
+        self.key = tuple(key)
+        sequence = np.random.SeedSequence(seed, spawn_key=self.key)
+        generator = np.random.Generator(np.random.PCG64(sequence))
+        blocks = iter(lambda: generator.random(block_size).tolist(), None)
+        # random() is the iterator's own __next__, so a draw costs no more
+        # than a call into random.Random.
+        self.random = itertools.chain.from_iterable(blocks).__next__
@@ -1,4 +1,53 @@
+import argparse
+import atexit
+import copy
+import os
 import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from urllib.request import pathname2url
+
+import profiling
+
+
+DATABASE_FILENAME = 'lahman-baseball-mysql/lahmansbaseballdb.sqlite'
+CACHE_FILENAME = 'lahman-baseball-mysql/lahmansbaseballdb.cache.sqlite'
+
+# Bumped whenever CACHE_COLUMNS or the cache layout changes, so caches
+# built by older code are ignored.
+CACHE_VERSION = 1
+
+# Let SQLite read database pages through a memory map instead of read().
+MMAP_SIZE = 256 * 1024 * 1024
+
+STATEMENT_CACHE_SIZE = 256
+
+# Lookup columns used by models; leading columns double as single-column
+# indexes (e.g. batting filtered by team_ID alone in Team._get_player_ids).
+INDEXES = [
+    ('batting', ('team_ID', 'playerID')),
+    ('pitching', ('team_ID', 'playerID')),
+    ('fielding', ('team_ID', 'playerID')),
+    ('appearances', ('team_ID', 'playerID')),
+    ('teams', ('yearID', 'teamID')),
+    ('teams', ('name', 'yearID')),
+    ('people', ('playerID', )),
+]
+
+# The subset of the Lahman tables the simulator reads, copied by build-cache.
+CACHE_COLUMNS = [
+    ('teams', ('ID', 'yearID', 'lgID', 'teamID', 'name', 'W', 'L')),
+    ('people', ('playerID', 'nameFirst', 'nameLast', 'bats', 'throws')),
+    ('batting', (
+        'playerID', 'yearID', 'team_ID', 'G', 'AB', 'R', 'H', '2B', '3B', 'HR',
+        'RBI', 'SB', 'BB', 'SO', 'HBP', 'SF',
+    )),
+    ('pitching', ('playerID', 'yearID', 'team_ID', 'G', 'GS', 'H', 'BB', 'SO', 'BFP')),
+    ('fielding', ('playerID', 'yearID', 'team_ID', 'POS', 'G', 'GS')),
+    ('appearances', ('playerID', 'yearID', 'team_ID', 'G_dh')),
+]
 
 
 ATTRIBUTE_MAP = {
@@ -30,38 +79,386 @@ ATTRIBUTE_MAP = {
 
 class SqlLite(object):
 
-    def __init__(self, database_filename):
+    def __init__(self, database_filename, read_only=True, immutable=False):
         self.database_name = database_filename
-        self.connection = sqlite3.connect(database_filename)
-        self.cursor = self.connection.cursor()
+        self.read_only = read_only
+        self.immutable = immutable
+        self.connections_opened = 0
+        self.queries_executed = 0
+        self._local = threading.local()
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def _get_uri(self):
+        options = []
+        if self.read_only:
+            options.append('mode=ro')
+        if self.immutable:
+            options.append('immutable=1')
+        uri = 'file:{}'.format(pathname2url(os.path.abspath(self.database_name)))
+        if options:
+            uri += '?' + '&'.join(options)
+        return uri
+
+    def _connect(self):
+        # Connections are only ever used by the thread that opened them, but
+        # shutdown() may close them from another thread.
+        connection = sqlite3.connect(
+            self._get_uri(),
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        connection.execute('PRAGMA mmap_size={};'.format(MMAP_SIZE))
+        current_thread = threading.current_thread()
+        with self._lock:
+            for thread in list(self._connections):
+                if not thread.is_alive():
+                    self._connections.pop(thread).close()
+            self._connections[current_thread] = connection
+            self.connections_opened += 1
+        self._local.connection = connection
+        return connection
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connect()
+        return connection
+
+    def query(self, cmd, params=()):
+        cursor = self.connection.execute(cmd, params)
+        with self._lock:
+            self.queries_executed += 1
+        return cursor
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            return
+        self._local.connection = None
+        with self._lock:
+            self._connections.pop(threading.current_thread(), None)
+        connection.close()
+
+    def shutdown(self):
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        # Any thread still holding a closed connection reconnects lazily.
+        self._local = threading.local()
+        for connection in connections:
+            connection.close()
 
-    def query(self, cmd):
-        return self.cursor.execute(cmd)
+    def get_stats(self):
+        with self._lock:
+            return {
+                'connections_opened': self.connections_opened,
+                'connections_open': len(self._connections),
+                'queries_executed': self.queries_executed,
+            }
+
+
+_database = None
+_database_lock = threading.Lock()
+
+_table_columns = {}
+
+
+def _get_source_metadata(database_filename):
+    stat = os.stat(database_filename)
+    return {
+        'source': os.path.abspath(database_filename),
+        'version': str(CACHE_VERSION),
+        'source_size': str(stat.st_size),
+        'source_mtime': str(stat.st_mtime_ns),
+    }
+
+
+def is_cache_valid(cache_filename=CACHE_FILENAME, database_filename=DATABASE_FILENAME):
+    if not os.path.exists(cache_filename) or not os.path.exists(database_filename):
+        return False
+    uri = 'file:{}?mode=ro'.format(pathname2url(os.path.abspath(cache_filename)))
+    try:
+        connection = sqlite3.connect(uri, uri=True)
+        try:
+            if connection.execute('PRAGMA user_version;').fetchone()[0] != CACHE_VERSION:
+                return False
+            metadata = dict(connection.execute('SELECT key, value FROM cache_metadata;'))
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError:
+        return False
+    return metadata == _get_source_metadata(database_filename)
+
+
+def resolve_database(database_filename=DATABASE_FILENAME, cache_filename=CACHE_FILENAME):
+    # The cache stands in for the source database only while it was built
+    # from the source as it is now; otherwise the source is read directly.
+    if cache_filename and is_cache_valid(cache_filename, database_filename):
+        return cache_filename, True
+    return database_filename, False
+
+
+def configure(database_filename=DATABASE_FILENAME, read_only=True, immutable=False,
+              cache_filename=CACHE_FILENAME):
+    global _database
+    if cache_filename and read_only:
+        database_filename, cached = resolve_database(database_filename, cache_filename)
+        immutable = immutable or cached
+    with _database_lock:
+        if _database is not None:
+            _database.shutdown()
+        _table_columns.clear()
+        for table in list(Table._registry.values()):
+            table.invalidate()
+        _database = SqlLite(
+            database_filename,
+            read_only=read_only,
+            immutable=immutable,
+        )
+    return _database
 
 
 def sql():
-    return SqlLite('lahman-baseball-mysql/lahmansbaseballdb.sqlite')
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                database_filename, cached = resolve_database()
+                _database = SqlLite(database_filename, immutable=cached)
+    return _database
+
+
+def get_columns(table_name):
+    columns = _table_columns.get(table_name)
+    if columns is None:
+        result = sql().query('PRAGMA table_info("{}");'.format(table_name))
+        columns = tuple(row[1] for row in result)
+        if not columns:
+            raise RuntimeError('No such table: {}'.format(table_name))
+        _table_columns[table_name] = columns
+    return columns
+
+
+def shutdown():
+    if _database is not None:
+        _database.shutdown()
+
+
+atexit.register(shutdown)
+
+
+LOOKUP_OPERATORS = {
+    'exact': '=',
+    'ne': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'in': 'IN',
+    'like': 'LIKE',
+}
+
+
+def quote_identifier(name):
+    return '"{}"'.format(name.replace('"', '""'))
 
 
 class QueryRow(object):
 
-    def __init__(self, data):
-        self.data = data
-        for key, val in self.data.items():
-            translated_key = ATTRIBUTE_MAP.get(key, key)
-            setattr(self, translated_key, val)
+    __slots__ = ('__weakref__', )
+
+    columns = ()
+    _attributes = ()
+    _setters = ()
+
+    # Rows are only built by from_values, through a table's row class.
+
+    @classmethod
+    def from_values(cls, values):
+        row = cls.__new__(cls)
+        for setter, val in zip(cls._setters, values):
+            setter(row, val)
+        return row
+
+    @property
+    def data(self):
+        return {
+            column: getattr(self, attribute)
+            for column, attribute in zip(self.columns, self._attributes)
+        }
+
+
+def make_row_class(RowClass, columns):
+    attributes = tuple(ATTRIBUTE_MAP.get(x, x) for x in columns)
+    row_class = type(RowClass.__name__, (RowClass, ), {
+        '__slots__': attributes,
+        '__module__': RowClass.__module__,
+        'columns': columns,
+        '_attributes': attributes,
+    })
+    row_class._setters = tuple(
+        row_class.__dict__[attribute].__set__ for attribute in attributes
+    )
+    return row_class
+
+
+class Query(object):
+
+    def __init__(self, table):
+        self.table = table
+        self._filters = ()
+        self._columns = None
+        self._order_by = ()
+        self._limit = None
+
+    def _clone(self):
+        return copy.copy(self)
+
+    def filter(self, **kwargs):
+        filters = []
+        for key, val in kwargs.items():
+            column, lookup = self._get_key_and_lookup(key)
+            if lookup == 'in':
+                val = tuple(val)
+            filters.append((column, lookup, val))
+        query = self._clone()
+        query._filters = self._filters + tuple(filters)
+        return query
+
+    def only(self, *columns):
+        query = self._clone()
+        query._columns = tuple(columns)
+        return query
+
+    def order_by(self, *columns):
+        query = self._clone()
+        query._order_by = tuple(columns)
+        return query
+
+    def limit(self, num):
+        query = self._clone()
+        query._limit = num
+        return query
+
+    def _get_key_and_lookup(self, key):
+        if '__' in key:
+            column, lookup = key.split('__', 1)
+        else:
+            column, lookup = key, 'exact'
+        if lookup not in LOOKUP_OPERATORS:
+            raise RuntimeError('Unsupported lookup: {}'.format(key))
+        return column, lookup
+
+    def _get_shape(self):
+        filters = tuple(
+            (column, lookup, len(val) if lookup == 'in' else None)
+            for column, lookup, val in self._filters
+        )
+        return filters, self._columns, self._order_by, self._limit is not None
+
+    def _build_sql(self):
+        if self._columns:
+            projection = ', '.join(quote_identifier(x) for x in self._columns)
+        else:
+            projection = '*'
+        query = 'SELECT {} FROM {}'.format(projection, quote_identifier(self.table.table_name))
+
+        where = []
+        for column, lookup, val in self._filters:
+            operator = LOOKUP_OPERATORS[lookup]
+            if lookup == 'in':
+                placeholder = '({})'.format(', '.join('?' * len(val)))
+            else:
+                placeholder = '?'
+            where.append('{} {} {}'.format(quote_identifier(column), operator, placeholder))
+        if where:
+            query += ' WHERE ' + ' AND '.join(where)
+
+        if self._order_by:
+            ordering = []
+            for column in self._order_by:
+                if column.startswith('-'):
+                    ordering.append('{} DESC'.format(quote_identifier(column[1:])))
+                else:
+                    ordering.append(quote_identifier(column))
+            query += ' ORDER BY ' + ', '.join(ordering)
+
+        if self._limit is not None:
+            query += ' LIMIT ?'
+        return query + ';'
+
+    def compile(self):
+        # The SQL text only depends on the shape of the query, so identical
+        # lookups reuse both this string and SQLite's prepared statement.
+        shape = self._get_shape()
+        statement = self.table._statements.get(shape)
+        if statement is None:
+            statement = self._build_sql()
+            self.table._statements[shape] = statement
+
+        params = []
+        for _, lookup, val in self._filters:
+            if lookup == 'in':
+                params.extend(val)
+            else:
+                params.append(val)
+        if self._limit is not None:
+            params.append(self._limit)
+        return statement, params
+
+    def get_cache_key(self):
+        filters = []
+        for column, lookup, val in self._filters:
+            if lookup == 'in':
+                val = frozenset(val)
+            filters.append((column, lookup, val))
+        filters.sort(key=lambda x: x[:2])
+        return tuple(filters), self._columns, self._order_by, self._limit
+
+    def all(self):
+        return self.table._execute(self)
+
+    def __iter__(self):
+        return iter(self.all())
 
 
 class Table(object):
 
-    def __init__(self, table_name, RowClass=QueryRow):
-        self.table_name = table_name
-        self.RowClass = RowClass
-        self.columns = self._get_columns()
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __new__(cls, table_name, RowClass=QueryRow):
+        key = (cls, table_name, RowClass)
+        with cls._registry_lock:
+            table = cls._registry.get(key)
+            if table is None:
+                table = super(Table, cls).__new__(cls)
+                table.table_name = table_name
+                table.RowClass = RowClass
+                table._statements = {}
+                table._row_classes = {}
+                table._cache = None
+                table._identity_map = None
+                table._cache_lock = threading.Lock()
+                table.cache_size = 0
+                table.cache_hits = 0
+                table.cache_misses = 0
+                table.cache_evictions = 0
+                cls._registry[key] = table
+        return table
+
+    @property
+    def columns(self):
+        return get_columns(self.table_name)
+
+    def query(self):
+        return Query(self)
 
     def all(self):
-        result = sql().query("SELECT * FROM '{}';".format(self.table_name))
-        return self._create_result_dict(result)
+        return self.query().all()
 
     def get(self, **kwargs):
         result = self.filter(**kwargs)
@@ -71,44 +468,306 @@ class Table(object):
             raise RuntimeError('Could not get record')
 
     def filter(self, **kwargs):
-        filter_args = []
-        for key, val in kwargs.items():
-            key, operator = self._get_key_and_operator(key)
-            value = self._get_value(val)
-            arg = "{} {} {}".format(key, operator, value)
-            filter_args.append(arg)
-        query = "SELECT * FROM '{}' WHERE {};".format(
-            self.table_name,
-            ' AND '.join(filter_args),
-        )
-        result = sql().query(query)
-        return self._create_result_dict(result)
+        return self.query().filter(**kwargs).all()
 
-    def _get_key_and_operator(self, key):
-        if '__' in key:
-            tokens = key.split('__')
-            return tokens[0], tokens[1]
-        return key, '='
+    def enable_cache(self, size=1024):
+        with self._cache_lock:
+            if self._cache is None:
+                self._cache = OrderedDict()
+                self._identity_map = weakref.WeakValueDictionary()
+            self.cache_size = size
+            self._evict()
+
+    def disable_cache(self):
+        with self._cache_lock:
+            self._cache = None
+            self._identity_map = None
+            self.cache_size = 0
+
+    def invalidate(self):
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache.clear()
+                self._identity_map = weakref.WeakValueDictionary()
+
+    def get_cache_stats(self):
+        with self._cache_lock:
+            return {
+                'enabled': self._cache is not None,
+                'size': self.cache_size,
+                'entries': len(self._cache) if self._cache is not None else 0,
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'evictions': self.cache_evictions,
+            }
+
+    def _evict(self):
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.cache_evictions += 1
+
+    def _execute(self, query):
+        if self._cache is None:
+            return self._fetch(query)
+
+        key = query.get_cache_key()
+        with self._cache_lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return list(rows)
+            self.cache_misses += 1
+
+        rows = self._fetch(query)
+        with self._cache_lock:
+            if self._cache is not None:
+                self._cache[key] = rows
+                self._evict()
+        return list(rows)
+
+    def _fetch(self, query):
+        statement, params = query.compile()
+        profiler = profiling.active
+        if profiler is None:
+            result = sql().query(statement, params)
+            return self._create_result_dict(result, query._columns)
+
+        # Fetch everything up front so query time and row construction are
+        # measured separately.
+        start = time.perf_counter()
+        result = sql().query(statement, params).fetchall()
+        fetched = time.perf_counter()
+        rows = self._create_result_dict(result, query._columns)
+        profiler.add('db.query', fetched - start)
+        profiler.add('db.rows', time.perf_counter() - fetched, len(rows))
+        return rows
+
+    def get_row_class(self, columns=None):
+        columns = tuple(columns or self.columns)
+        row_class = self._row_classes.get(columns)
+        if row_class is None:
+            row_class = make_row_class(self.RowClass, columns)
+            self._row_classes[columns] = row_class
+        return row_class
 
-    def _get_value(self, value):
-        if isinstance(value, (set, list, )):
-            return '({})'.format(', '.join("'{}'".format(x) for x in value))
-        return "'{}'".format(value)
+    def _create_result_dict(self, result, columns=None):
+        columns = columns or self.columns
+        from_values = self.get_row_class(columns).from_values
+        identity_map = self._identity_map
+        if identity_map is None:
+            return [from_values(row) for row in result]
 
-    def _create_result_dict(self, result):
         all_result = []
         for row in result:
-            row_dict = {}
-            for idx, column_name in enumerate(self.columns):
-                row_dict[column_name] = row[idx]
-            all_result.append(self.RowClass(row_dict))
+            # Rows with identical contents map to one shared object, so
+            # overlapping cached lookups hand back the same instances.
+            identity_key = (columns, row)
+            row_object = identity_map.get(identity_key)
+            if row_object is None:
+                row_object = from_values(row)
+                identity_map[identity_key] = row_object
+            all_result.append(row_object)
         return all_result
 
-    def _get_columns(self):
-        result = sql().query("""
-            SELECT * FROM '{}';
-        """.format(self.table_name))
-        columns = []
-        for row in result.description:
-            columns.append(row[0])
-        return columns
+
+def get_index_name(table_name, columns):
+    return 'idx_{}_{}'.format(table_name, '_'.join(columns)).lower()
+
+
+def create_indexes(connection, schema=None):
+    prefix = '{}.'.format(quote_identifier(schema)) if schema else ''
+    for table_name, columns in INDEXES:
+        connection.execute('CREATE INDEX IF NOT EXISTS {}{} ON {} ({});'.format(
+            prefix,
+            quote_identifier(get_index_name(table_name, columns)),
+            quote_identifier(table_name),
+            ', '.join(quote_identifier(x) for x in columns),
+        ))
+
+
+def _get_index_sample(connection, table_name, columns):
+    statement = 'SELECT {} FROM {} WHERE {} LIMIT 1;'.format(
+        ', '.join(quote_identifier(x) for x in columns),
+        quote_identifier(table_name),
+        ' AND '.join('{} IS NOT NULL'.format(quote_identifier(x)) for x in columns),
+    )
+    query = 'SELECT * FROM {} WHERE {};'.format(
+        quote_identifier(table_name),
+        ' AND '.join('{} = ?'.format(quote_identifier(x)) for x in columns),
+    )
+    return query, connection.execute(statement).fetchone()
+
+
+def _time_query(connection, query, params, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        connection.execute(query, params).fetchall()
+    return (time.perf_counter() - start) / repeat
+
+
+def _get_query_plan(connection, query, params):
+    plan = connection.execute('EXPLAIN QUERY PLAN ' + query, params).fetchall()
+    return ' / '.join(row[-1] for row in plan)
+
+
+def prepare_database(database_filename=DATABASE_FILENAME, repeat=20):
+    connection = sqlite3.connect(database_filename)
+    try:
+        samples = []
+        for table_name, columns in INDEXES:
+            query, params = _get_index_sample(connection, table_name, columns)
+            if params is None:
+                before = None
+            else:
+                before = _time_query(connection, query, params, repeat)
+            samples.append((table_name, columns, query, params, before))
+
+        create_indexes(connection)
+        connection.execute('ANALYZE;')
+        connection.commit()
+
+        report = []
+        for table_name, columns, query, params, before in samples:
+            index_name = get_index_name(table_name, columns)
+            plan = None
+            after = None
+            if params is not None:
+                plan = _get_query_plan(connection, query, params)
+                after = _time_query(connection, query, params, repeat)
+            report.append({
+                'table': table_name,
+                'index': index_name,
+                'columns': list(columns),
+                'plan': plan,
+                'uses_index': plan is not None and 'INDEX' in plan,
+                'before': before,
+                'after': after,
+            })
+    finally:
+        connection.close()
+
+    failed = [x['index'] for x in report if x['plan'] is not None and not x['uses_index']]
+    if failed:
+        raise RuntimeError('Indexes not used by lookups: {}'.format(', '.join(failed)))
+    return report
+
+
+def _format_timing(seconds):
+    if seconds is None:
+        return '-'
+    return '{:.3f}ms'.format(seconds * 1000)
+
+
+def print_prepare_report(report):
+    for entry in report:
+        print('{:<40} {:>10} -> {:>10}  {}'.format(
+            entry['index'],
+            _format_timing(entry['before']),
+            _format_timing(entry['after']),
+            entry['plan'] or 'no rows',
+        ))
+
+
+def build_cache(database_filename=DATABASE_FILENAME, cache_filename=CACHE_FILENAME):
+    # Built under a temporary name and renamed into place, so readers never
+    # see a partial cache.
+    temp_filename = '{}.{}.tmp'.format(cache_filename, os.getpid())
+    if os.path.exists(temp_filename):
+        os.remove(temp_filename)
+    metadata = _get_source_metadata(database_filename)
+    connection = sqlite3.connect(temp_filename)
+    report = []
+    try:
+        connection.execute('ATTACH DATABASE ? AS source;', (
+            'file:{}?mode=ro'.format(pathname2url(os.path.abspath(database_filename))),
+        ))
+        for table_name, columns in CACHE_COLUMNS:
+            source_columns = set(
+                row[1] for row in connection.execute(
+                    'PRAGMA source.table_info({});'.format(quote_identifier(table_name))
+                )
+            )
+            if not source_columns:
+                raise RuntimeError('No such table: {}'.format(table_name))
+            columns = [x for x in columns if x in source_columns]
+            column_list = ', '.join(quote_identifier(x) for x in columns)
+            connection.execute('CREATE TABLE main.{} AS SELECT {} FROM source.{};'.format(
+                quote_identifier(table_name),
+                column_list,
+                quote_identifier(table_name),
+            ))
+            num_rows = connection.execute('SELECT COUNT(*) FROM main.{};'.format(
+                quote_identifier(table_name),
+            )).fetchone()[0]
+            report.append((table_name, len(columns), len(source_columns), num_rows))
+
+        create_indexes(connection, schema='main')
+
+        connection.execute('CREATE TABLE main.cache_metadata (key TEXT PRIMARY KEY, value TEXT);')
+        connection.executemany(
+            'INSERT INTO main.cache_metadata VALUES (?, ?);',
+            sorted(metadata.items()),
+        )
+        connection.execute('PRAGMA main.user_version={};'.format(CACHE_VERSION))
+        connection.commit()
+        connection.execute('DETACH DATABASE source;')
+        connection.execute('ANALYZE;')
+        connection.execute('VACUUM;')
+    except Exception:
+        connection.close()
+        os.remove(temp_filename)
+        raise
+    connection.close()
+    os.replace(temp_filename, cache_filename)
+    return report
+
+
+def print_cache_report(report, database_filename=DATABASE_FILENAME, cache_filename=CACHE_FILENAME):
+    for table_name, num_columns, num_source_columns, num_rows in report:
+        print('{:<12} {:>3}/{:<3} columns {:>10} rows'.format(
+            table_name,
+            num_columns,
+            num_source_columns,
+            num_rows,
+        ))
+    print('{}: {:.1f}MB -> {:.1f}MB'.format(
+        cache_filename,
+        os.path.getsize(database_filename) / 1e6,
+        os.path.getsize(cache_filename) / 1e6,
+    ))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    prepare_parser = subparsers.add_parser('prepare-db')
+    prepare_parser.add_argument(
+        '--database',
+        action='store',
+        default=DATABASE_FILENAME,
+    )
+    prepare_parser.add_argument(
+        '--repeat',
+        action='store',
+        type=int,
+        default=20,
+    )
+    cache_parser = subparsers.add_parser('build-cache')
+    cache_parser.add_argument(
+        '--database',
+        action='store',
+        default=DATABASE_FILENAME,
+    )
+    cache_parser.add_argument(
+        '--cache',
+        action='store',
+        default=CACHE_FILENAME,
+    )
+    args = parser.parse_args()
+
+    if args.command == 'prepare-db':
+        print_prepare_report(prepare_database(args.database, args.repeat))
+    elif args.command == 'build-cache':
+        report = build_cache(args.database, args.cache)
+        print_cache_report(report, args.database, args.cache)
@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import batch
+import markov
+import models
+import parallel
+import profiles
+import season
+import sim
+import tables
+
+from benchmarks import fixture
+
+
+NUM_GAMES = 20000
+SEED = 2019
+
+
+class FixtureTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        database_filename = fixture.build_fixture(os.path.join(cls.temp_dir, 'fixture.sqlite'))
+        tables.configure(database_filename, cache_filename=None)
+
+    @classmethod
+    def tearDownClass(cls):
+        tables.configure()
+        shutil.rmtree(cls.temp_dir)
+
+    def get_teams(self):
+        return (
+            models.Teams.get(teamID='NYA', yearID=2019),
+            models.Teams.get(teamID='BOS', yearID=2019),
+        )
+
+
+class MarkovTest(FixtureTestCase):
+
+    def test_matches_simulation(self):
+        home_team, away_team = self.get_teams()
+        solution, simulated, std_error = markov.compare_with_simulation(
+            home_team,
+            away_team,
+            NUM_GAMES,
+            seed=SEED,
+        )
+
+        self.assertAlmostEqual(solution.home_win_pct + solution.away_win_pct, 1.0, places=6)
+        self.assertLess(
+            abs(simulated.home_win_pct - solution.home_win_pct),
+            3 * std_error,
+        )
+
+
+class SeedTest(FixtureTestCase):
+
+    def assertSameResult(self, first, second):
+        self.assertEqual(first.games, second.games)
+        self.assertEqual(first.home_wins, second.home_wins)
+        self.assertEqual(first.runs, second.runs)
+        self.assertEqual(first.lines.tolist(), second.lines.tolist())
+
+    def test_batch_matches_parallel(self):
+        home_team, away_team = [profiles.get_team_profile(x) for x in self.get_teams()]
+        serial = batch.simulate_games(home_team, away_team, 600, seed=SEED)
+        pooled = parallel.simulate_matchups(
+            [(home_team, away_team)],
+            600,
+            workers=3,
+            seed=SEED,
+            chunk_size=70,
+            keys=[()],
+        )[0]
+        self.assertSameResult(serial, pooled)
+
+    def test_game_matches_batch(self):
+        home_team, away_team = [profiles.get_team_profile(x) for x in self.get_teams()]
+        game = sim.Game(home_team, away_team, 0, listener=sim.NullListener(), seed=SEED)
+        game.simulate()
+        result = batch.simulate_games(home_team, away_team, 1, seed=SEED)
+        self.assertEqual(game.lines.as_array().tolist(), result.lines.tolist())
+
+    def test_season_matches_workers(self):
+        serial = season.simulate_season(2019, workers=1, seed=SEED)
+        pooled = season.simulate_season(2019, workers=3, seed=SEED)
+        for team_id, record in serial.records.items():
+            other = pooled.records[team_id]
+            self.assertEqual(
+                (record.wins, record.losses, record.runs_scored, record.runs_allowed),
+                (other.wins, other.losses, other.runs_scored, other.runs_allowed),
+            )
+            self.assertEqual(serial.lines[team_id].tolist(), pooled.lines[team_id].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
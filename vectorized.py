@@ -0,0 +1,214 @@
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+import basestate
+import batch
+import events
+import matchups
+import models
+import profiles
+
+
+AWAY = 0
+HOME = 1
+
+TOP = 0
+BOTTOM = 1
+
+NUM_BATTERS = 9
+NUM_HIT_TYPES = basestate.NUM_HIT_TYPES
+
+DEFAULT_BATCH_SIZE = 8192
+
+
+# Base state tables shared with Game; see basestate.
+WALK_NEXT_BASES = np.array([x.next_bases for x in basestate.WALK_TRANSITIONS], dtype=np.int8)
+WALK_RUNS = np.array([x.runs for x in basestate.WALK_TRANSITIONS], dtype=np.int8)
+HIT_NEXT_BASES = np.array([
+    [x.next_bases for x in transitions] for transitions in basestate.HIT_TRANSITIONS
+], dtype=np.int8)
+HIT_RUNS = np.array([
+    [x.runs for x in transitions] for transitions in basestate.HIT_TRANSITIONS
+], dtype=np.int8)
+
+
+class TeamArrays(object):
+
+    def __init__(self, away_profile, home_profile):
+        team_profiles = [away_profile, home_profile]
+        # Cumulative outcome table of every batter against the other team's
+        # pitcher, the same ones Game draws from.
+        self.matchups = np.array([
+            [
+                matchups.get_matchup(batter, team_profiles[1 - idx].pitcher).cumulative
+                for batter in team.batting_order
+            ]
+            for idx, team in enumerate(team_profiles)
+        ])
+
+
+class GameBatch(object):
+
+    def __init__(self, arrays, size, rng):
+        self.arrays = arrays
+        self.rng = rng
+        self.inning = np.ones(size, dtype=np.int32)
+        self.half = np.full(size, TOP, dtype=np.int8)
+        self.outs = np.zeros(size, dtype=np.int8)
+        self.bases = np.zeros(size, dtype=np.int8)
+        self.batting_idx = np.zeros((size, 2), dtype=np.int8)
+        self.runs = np.zeros((size, 2), dtype=np.int32)
+        self.hits = np.zeros((size, 2), dtype=np.int32)
+        self.walks = np.zeros((size, 2), dtype=np.int32)
+
+    def __len__(self):
+        return len(self.inning)
+
+    def _reset(self, idx):
+        self.inning[idx] = 1
+        self.half[idx] = TOP
+        self.outs[idx] = 0
+        self.bases[idx] = 0
+        self.batting_idx[idx] = 0
+        self.runs[idx] = 0
+        self.hits[idx] = 0
+        self.walks[idx] = 0
+
+    def _keep(self, idx):
+        for name in ['inning', 'half', 'outs', 'bases', 'batting_idx', 'runs', 'hits', 'walks']:
+            setattr(self, name, getattr(self, name)[idx])
+
+    def step(self):
+        arrays = self.arrays
+        num_games = len(self)
+        rows = np.arange(num_games)
+        team = self.half
+        batter = self.batting_idx[rows, team]
+
+        # One draw per game picks the outcome code, as bisect_right does in
+        # Game.
+        draws = self.rng.random(num_games)
+        outcome = (draws[:, None] >= arrays.matchups[team, batter]).sum(axis=1)
+
+        is_walk = outcome == events.OUTCOME_WALK
+        is_hit = (outcome >= events.OUTCOME_SINGLE) & (outcome <= events.OUTCOME_HOME_RUN)
+        is_out = (outcome == events.OUTCOME_STRIKEOUT) | (outcome >= events.OUTCOME_GROUND_OUT)
+        hit_type = np.clip(outcome - events.OUTCOME_SINGLE, 0, NUM_HIT_TYPES - 1)
+
+        bases = self.bases
+        runs = np.where(
+            is_walk,
+            WALK_RUNS[bases],
+            np.where(is_hit, HIT_RUNS[hit_type, bases], 0),
+        )
+        self.bases = np.where(
+            is_walk,
+            WALK_NEXT_BASES[bases],
+            np.where(is_hit, HIT_NEXT_BASES[hit_type, bases], bases),
+        ).astype(np.int8)
+        self.outs += is_out
+        self.runs[rows, team] += runs
+        self.hits[rows, team] += is_hit
+        self.walks[rows, team] += is_walk
+        self.batting_idx[rows, team] = (batter + 1) % NUM_BATTERS
+
+        half_over = self.outs >= 3
+        home_runs = self.runs[:, HOME]
+        away_runs = self.runs[:, AWAY]
+        game_over = half_over & (self.inning >= 9) & (
+            ((self.half == TOP) & (home_runs > away_runs))
+            | ((self.half == BOTTOM) & (home_runs != away_runs))
+        )
+
+        advance = half_over & ~game_over
+        self.outs[advance] = 0
+        self.bases[advance] = 0
+        self.inning[advance & (self.half == BOTTOM)] += 1
+        self.half[advance] = 1 - self.half[advance]
+        return game_over
+
+
+def _add_finished(result, game_batch, finished):
+    runs = game_batch.runs[finished]
+    hits = game_batch.hits[finished]
+    walks = game_batch.walks[finished]
+    team_types = {'away': AWAY, 'home': HOME}
+    result.add_summary(
+        games=len(runs),
+        home_wins=int((runs[:, HOME] > runs[:, AWAY]).sum()),
+        extra_innings=int((game_batch.inning[finished] > 9).sum()),
+        runs={
+            team_type: Counter(runs[:, idx].tolist())
+            for team_type, idx in team_types.items()
+        },
+        hits={team_type: int(hits[:, idx].sum()) for team_type, idx in team_types.items()},
+        walks={team_type: int(walks[:, idx].sum()) for team_type, idx in team_types.items()},
+    )
+
+
+def simulate_games(home_team, away_team, num_games, batch_size=DEFAULT_BATCH_SIZE, seed=None):
+    home_profile = profiles.get_team_profile(home_team)
+    away_profile = profiles.get_team_profile(away_team)
+    arrays = TeamArrays(away_profile, home_profile)
+    rng = np.random.default_rng(seed)
+
+    result = batch.BatchResult(home_profile, away_profile)
+    result.seed = seed
+    start = time.perf_counter()
+
+    pending = num_games - min(batch_size, num_games)
+    game_batch = GameBatch(arrays, min(batch_size, num_games), rng)
+    while len(game_batch):
+        finished = game_batch.step()
+        if not finished.any():
+            continue
+        _add_finished(result, game_batch, finished)
+
+        # Refill finished slots with new games while any remain, then let
+        # the batch shrink as the last games complete.
+        finished_idx = np.flatnonzero(finished)
+        refill = finished_idx[:pending]
+        if len(refill):
+            game_batch._reset(refill)
+            pending -= len(refill)
+        if len(refill) < len(finished_idx):
+            keep = np.ones(len(game_batch), dtype=bool)
+            keep[finished_idx[len(refill):]] = False
+            game_batch._keep(keep)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('home', action='store')
+    parser.add_argument('home_year', action='store')
+    parser.add_argument('away', action='store')
+    parser.add_argument('away_year', action='store')
+    parser.add_argument(
+        '--games',
+        action='store',
+        type=int,
+        default=100000,
+    )
+    parser.add_argument(
+        '--batch_size',
+        action='store',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+    )
+    parser.add_argument(
+        '--seed',
+        action='store',
+        type=int,
+        default=None,
+    )
+    args = parser.parse_args()
+
+    home_team = models.Teams.filter(yearId=args.home_year, teamId=args.home)[0]
+    away_team = models.Teams.filter(yearId=args.away_year, teamId=args.away)[0]
+    print(simulate_games(home_team, away_team, args.games, args.batch_size, args.seed))